@@ -0,0 +1,180 @@
+"""
+Compare two timing runs and fail on significant slowdowns.
+
+Accepts benchmarks.throughput runs (per-trial seconds) and runner instrumentation files
+(data/scores/*.timings.jsonl, seconds per call for every dataset/language) and aligns them by
+backend, model, stage and batch config. Benchmark trials are bootstrapped as repeated measurements;
+instrumentation jobs are paired by dataset/language across the two runs and their per-job ratios are bootstrapped,
+so the interval reflects run-to-run noise rather than the dataset mix.
+A path of the baseline missing from the new run fails the comparison unless --allow-missing is given.
+
+    python -m benchmarks.compare benchmarks/baselines/throughput.jsonl run.jsonl --threshold 0.05
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+from collections import defaultdict
+
+BOOTSTRAP_SAMPLES = 2000
+CONFIDENCE = 0.95
+DEFAULT_THRESHOLD = 0.05  # Fail when a path is significantly more than 5% slower
+MIN_TRIALS = 3  # Fewer samples on either side give no verdict
+
+
+def _config(record):
+    """Batch configuration of a record: the benchmark batch size or the runner job's options."""
+    if "batch_size" in record:
+        return "" if record["batch_size"] is None else f"batch={record['batch_size']}"
+    return json.dumps(record.get("options") or {}, sort_keys=True)
+
+
+def load_samples(path):
+    """
+    {(backend, model, stage, config): samples} from a benchmark or instrumentation JSONL file.
+    Benchmark samples are a list of trial seconds; instrumentation samples are {(dataset, language): [seconds per call, ...]}.
+    """
+    samples = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            key = (record.get("backend") or "", record["model"], record["stage"], _config(record))
+            if "trial_seconds" in record:
+                samples.setdefault(key, []).extend(record["trial_seconds"])
+            elif record.get("calls"):
+                jobs = samples.setdefault(key, {})
+                jobs.setdefault((record["dataset"], record["language"]), []).append(record["wall_seconds"] / record["calls"])
+    return samples
+
+
+def _ratio(after, before):
+    if before:
+        return after / before
+    return 1.0 if not after else float("inf")
+
+
+def bootstrap_ratio(before, after, samples=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    Ratio of mean time after/before with a percentile bootstrap confidence interval
+    (> 1 means slower). Returns (ratio, low, high).
+    """
+    rng = random.Random(seed)
+    ratios = []
+    for _ in range(samples):
+        b = statistics.fmean(rng.choices(before, k=len(before)))
+        a = statistics.fmean(rng.choices(after, k=len(after)))
+        ratios.append(_ratio(a, b))
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (samples - 1))]
+    high = ratios[int((1 - tail) * (samples - 1))]
+    return _ratio(statistics.fmean(after), statistics.fmean(before)), low, high
+
+
+def bootstrap_paired(before, after, samples=BOOTSTRAP_SAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    Mean of per-job after/before time ratios over the jobs both runs have, with a percentile bootstrap
+    confidence interval over jobs (> 1 means slower). Returns (ratio, low, high, paired job count).
+    """
+    jobs = sorted(set(before) & set(after))
+    if not jobs:
+        return float("nan"), float("nan"), float("nan"), 0
+    ratios = [_ratio(statistics.fmean(after[job]), statistics.fmean(before[job])) for job in jobs]
+    rng = random.Random(seed)
+    means = sorted(statistics.fmean(rng.choices(ratios, k=len(ratios))) for _ in range(samples))
+    tail = (1 - confidence) / 2
+    return statistics.fmean(ratios), means[int(tail * (samples - 1))], means[int((1 - tail) * (samples - 1))], len(jobs)
+
+
+def _mean(samples):
+    """Mean seconds of a trial list, or of the per-job means of instrumentation samples."""
+    if isinstance(samples, dict):
+        return statistics.fmean(statistics.fmean(values) for values in samples.values())
+    return statistics.fmean(samples)
+
+
+def _inverse(value):
+    return 1 / value if value else float("inf")
+
+
+def compare(before_path, after_path, threshold=DEFAULT_THRESHOLD):
+    """
+    Align two runs and classify every key. A key is "slower" or "faster" only when the whole
+    confidence interval lies beyond the threshold, otherwise "same" ("few" with less than MIN_TRIALS samples
+    or paired jobs). Keys of the first run missing from the second are "missing".
+    Returns one row dict per key.
+    """
+    before, after = load_samples(before_path), load_samples(after_path)
+    rows = []
+    for key in sorted(set(before) | set(after)):
+        backend, model, stage, config = key
+        row = {"backend": backend, "model": model, "stage": stage, "config": config}
+        if key not in after:
+            rows.append({**row, "before": _mean(before[key]), "after": None, "ratio": None, "low": None, "high": None,
+                         "verdict": "missing", "trials": (len(before[key]), 0)})
+            continue
+        if key not in before:
+            print(f"ℹ️ New in the second run: {' | '.join(k for k in key if k)}")
+            continue
+        if isinstance(before[key], dict) != isinstance(after[key], dict):
+            print(f"⚠️ Not comparable (benchmark trials vs instrumentation jobs): {' | '.join(k for k in key if k)}")
+            continue
+
+        if isinstance(before[key], dict):
+            ratio, low, high, paired = bootstrap_paired(before[key], after[key])
+            trials = (paired, paired)
+        else:
+            ratio, low, high = bootstrap_ratio(before[key], after[key])
+            trials = (len(before[key]), len(after[key]))
+        if min(trials) < MIN_TRIALS:
+            verdict = "few"
+        else:
+            verdict = "slower" if low > 1 + threshold else "faster" if high < 1 / (1 + threshold) else "same"
+        rows.append({**row, "before": _mean(before[key]), "after": _mean(after[key]),
+                     "ratio": ratio, "low": low, "high": high, "verdict": verdict, "trials": trials})
+    return rows
+
+
+def print_rows(rows):
+    """One compact table per backend."""
+    by_backend = defaultdict(list)
+    for row in rows:
+        by_backend[row["backend"]].append(row)
+    marks = {"slower": "❌", "faster": "🚀", "same": "  ", "few": "❔", "missing": "🚫"}
+    for backend, backend_rows in by_backend.items():
+        print(f"\n{backend or '(no backend)'}")
+        print(f"  {'model / stage':<44}{'config':<14}{'before s':>10}{'after s':>10}{'speedup':>9}{'95% CI':>17}  n")
+        for r in backend_rows:
+            name = f"{r['model']} / {r['stage']}"
+            if r["verdict"] == "missing":
+                print(f"{marks['missing']}{name:<44.44}{r['config']:<14.14}{r['before']:10.4f}{'missing':>10}")
+                continue
+            ci = f"{_inverse(r['high']):.2f}-{_inverse(r['low']):.2f}x"
+            print(f"{marks[r['verdict']]}{name:<44.44}{r['config']:<14.14}{r['before']:10.4f}{r['after']:10.4f}"
+                  f"{_inverse(r['ratio']):8.2f}x{ci:>17}  {r['trials'][0]}/{r['trials'][1]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark or instrumentation JSONL runs.")
+    parser.add_argument("before", help="Baseline run")
+    parser.add_argument("after", help="New run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before failing, as a fraction (default: %(default)s)")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="Do not fail when a path of the baseline is missing from the new run")
+    args = parser.parse_args()
+
+    rows = compare(args.before, args.after, args.threshold)
+    print_rows(rows)
+    slower = [r for r in rows if r["verdict"] == "slower"]
+    missing = [r for r in rows if r["verdict"] == "missing"]
+    if slower:
+        print(f"\n❌ {len(slower)} path(s) significantly slower than the baseline (threshold {args.threshold:.0%})")
+    if missing:
+        print(f"\n{'⚠️' if args.allow_missing else '❌'} {len(missing)} path(s) of the baseline missing from the new run")
+    if slower or (missing and not args.allow_missing):
+        sys.exit(1)
+    print(f"\n✅ No significant slowdown beyond {args.threshold:.0%}")
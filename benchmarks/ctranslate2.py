@@ -0,0 +1,84 @@
+import argparse
+import json
+import time
+
+from benchmarks.quantization import MODELS
+
+
+def _timed_translate(backend_name, model_id, sentences, language, options):
+    """Translate after a one-sentence warm-up (which also loads the model). Returns (translations, seconds)."""
+    from helpers.backends import BACKENDS
+
+    translate = BACKENDS[backend_name]["translate"]
+    translate(model_id, sentences[:1], language, options)
+    start = time.perf_counter()
+    translations = translate(model_id, sentences, language, options)
+    return translations, time.perf_counter() - start
+
+
+def compare(backend_name, dataset, language, sample_size=None, options=None):
+    """
+    Translate the same samples with a transformers backend and with CTranslate2.
+    Reports throughput, exact-match rate, BLEU of the CTranslate2 output against the transformers output
+    (parity) and BLEU of both against the references.
+    """
+    from helpers.evaluation import compute_bleu
+    from helpers.model_cache import release_model
+    from helpers.runner import load_samples
+
+    model_id = MODELS[backend_name]
+    sources, references = load_samples(dataset, language)
+    if sample_size:
+        sources, references = sources[:sample_size], references[:sample_size]
+    if not sources:
+        raise ValueError(f"No samples for {language} in {dataset}")
+
+    print(f"🔹 {model_id} on {dataset} ({language}), {len(sources)} sentence(s)")
+    reference_output, reference_seconds = _timed_translate(backend_name, model_id, sources, language, {})
+    release_model(model_id)
+    ct2_output, ct2_seconds = _timed_translate("ctranslate2", model_id, sources, language, options or {})
+    release_model(model_id)
+
+    return {
+        "backend": backend_name,
+        "model": model_id,
+        "sentences": len(sources),
+        "transformers_sentences_per_second": len(sources) / reference_seconds,
+        "ctranslate2_sentences_per_second": len(sources) / ct2_seconds,
+        "speedup": reference_seconds / ct2_seconds,
+        "exact_match": sum(a == b for a, b in zip(reference_output, ct2_output)) / len(sources),
+        "parity_bleu": compute_bleu(reference_output, ct2_output),
+        "transformers_bleu": compute_bleu(references, reference_output),
+        "ctranslate2_bleu": compute_bleu(references, ct2_output),
+    }
+
+
+def print_results(results):
+    print(f"{'backend':<10}{'hf sent/s':>11}{'ct2 sent/s':>12}{'speedup':>9}{'exact':>8}{'parity BLEU':>13}{'hf BLEU':>9}{'ct2 BLEU':>10}")
+    for r in results:
+        print(f"{r['backend']:<10}{r['transformers_sentences_per_second']:11.2f}{r['ctranslate2_sentences_per_second']:12.2f}"
+              f"{r['speedup']:9.2f}{r['exact_match']:8.0%}{r['parity_bleu']:13.2f}{r['transformers_bleu']:9.2f}{r['ctranslate2_bleu']:10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check CTranslate2 output parity and speed against the transformers loaders.")
+    parser.add_argument("--backends", nargs="*", choices=sorted(MODELS), default=sorted(MODELS))
+    parser.add_argument("--dataset", default="Europarl")
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--sample-size", type=int, help="Only use the first N samples")
+    parser.add_argument("--compute-type", help="CTranslate2 compute type, e.g. int8")
+    parser.add_argument("--intra-threads", type=int, default=0, help="CTranslate2 threads per batch (0 = all cores)")
+    parser.add_argument("--batch-type", choices=["examples", "tokens"], default="examples")
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--out", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    options = {"intra_threads": args.intra_threads, "batch_type": args.batch_type, "max_batch_size": args.max_batch_size}
+    if args.compute_type:
+        options["compute_type"] = args.compute_type
+    results = [compare(backend, args.dataset, args.language, args.sample_size, options) for backend in args.backends]
+    print_results(results)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.out}")
@@ -0,0 +1,120 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import time
+
+# Local seq2seq backends that support options["quantize"], with their default model
+MODELS = {
+    "helsinki": "Helsinki-NLP/opus-mt-en-de",
+    "nllb": "facebook/nllb-200-distilled-600M",
+    "m2m": "facebook/m2m100_418M",
+}
+
+VARIANTS = ("fp32", "int8")
+
+
+def current_rss_mb():
+    """Resident memory of this process right now (Linux only, None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        return None
+
+
+def _run_variant(backend_name, model_id, language, sentences, variant, threads, queue):
+    """Load and run one variant in a fresh process so its peak RSS is measured on its own."""
+    import torch
+    from helpers.backends import BACKENDS
+
+    if threads:
+        torch.set_num_threads(threads)
+    translate = BACKENDS[backend_name]["translate"]
+    options = {"quantize": variant}
+
+    start = time.perf_counter()
+    translate(model_id, sentences[:1], language, options)  # Loads the model and warms up
+    load_seconds = time.perf_counter() - start
+    loaded_rss = current_rss_mb()
+
+    start = time.perf_counter()
+    translations = translate(model_id, sentences, language, options)
+    seconds = time.perf_counter() - start
+
+    queue.put({
+        "variant": variant,
+        "translations": translations,
+        "load_seconds": load_seconds,
+        "seconds": seconds,
+        "sentences_per_second": len(sentences) / seconds if seconds else None,
+        "loaded_rss_mb": loaded_rss,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+    })
+
+
+def benchmark(backend_name, model_id, dataset, language, sample_size=None, threads=None, comet=True):
+    """
+    Translate the same samples with fp32 and int8 weights and compare speed, memory and quality.
+    Returns one result dict per variant, with BLEU/COMET deltas against fp32.
+    """
+    from helpers.evaluation import compute_bleu, compute_comet
+    from helpers.runner import load_samples
+
+    sources, references = load_samples(dataset, language)
+    if sample_size:
+        sources, references = sources[:sample_size], references[:sample_size]
+    if not sources:
+        raise ValueError(f"No samples for {language} in {dataset}")
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for variant in VARIANTS:
+        print(f"🔹 {model_id} ({variant}) on {dataset} ({language}), {len(sources)} sentence(s)")
+        queue = context.Queue()
+        process = context.Process(target=_run_variant, args=(backend_name, model_id, language, sources, variant, threads, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+
+        result["bleu"] = compute_bleu(references, result["translations"])
+        result["comet"] = compute_comet(references, result["translations"], sources) if comet else None
+        results.append(result)
+
+    baseline = results[0]
+    for result in results:
+        result["bleu_delta"] = result["bleu"] - baseline["bleu"]
+        result["comet_delta"] = result["comet"] - baseline["comet"] if comet else None
+        result["speedup"] = baseline["seconds"] / result["seconds"] if result["seconds"] else None
+    return results
+
+
+def print_results(results):
+    print(f"{'variant':<8}{'sent/s':>9}{'speedup':>9}{'load RSS MB':>13}{'peak RSS MB':>13}{'BLEU':>8}{'ΔBLEU':>8}{'COMET':>8}{'ΔCOMET':>9}")
+    for r in results:
+        comet = f"{r['comet']:8.4f}{r['comet_delta']:+9.4f}" if r["comet"] is not None else f"{'-':>8}{'-':>9}"
+        loaded = f"{r['loaded_rss_mb']:13.0f}" if r["loaded_rss_mb"] is not None else f"{'-':>13}"
+        print(f"{r['variant']:<8}{r['sentences_per_second']:9.2f}{r['speedup']:9.2f}{loaded}{r['peak_rss_mb']:13.0f}"
+              f"{r['bleu']:8.2f}{r['bleu_delta']:+8.2f}{comet}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare fp32 and dynamic int8 CPU inference for the seq2seq models.")
+    parser.add_argument("--backend", choices=sorted(MODELS), default="nllb")
+    parser.add_argument("--model", help="Model id (default: the backend's usual model)")
+    parser.add_argument("--dataset", default="Europarl")
+    parser.add_argument("--language", default="de")
+    parser.add_argument("--sample-size", type=int, help="Only use the first N samples")
+    parser.add_argument("--threads", type=int, help="torch threads per run")
+    parser.add_argument("--no-comet", action="store_true", help="Skip COMET scoring")
+    parser.add_argument("--out", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = benchmark(args.backend, args.model or MODELS[args.backend], args.dataset, args.language,
+                        args.sample_size, args.threads, not args.no_comet)
+    print_results(results)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Results written to {args.out}")
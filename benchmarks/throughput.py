@@ -0,0 +1,178 @@
+"""
+Offline throughput benchmark of the models/load_* translate paths, on tiny random models (see tiny_models.py).
+
+    python -m benchmarks.throughput                      # run every path, print a table
+    python -m benchmarks.throughput --save-baseline      # store the run as the baseline
+    python -m benchmarks.throughput --out run.jsonl      # keep the run for benchmarks.compare
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+import torch
+import transformers
+
+from benchmarks import tiny_models
+from models import load_helsinki, load_M2M, load_NLLB, load_small100, load_towerinstruct
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "throughput.jsonl")
+
+DEFAULT_SENTENCES = 32
+DEFAULT_TRIALS = 5
+BATCH_SIZES = (8, 16)
+
+
+def _each(translate):
+    """Run a one-sentence translate path over every sentence, recording one latency per call."""
+    def run(sentences, latencies):
+        for sentence in sentences:
+            start = time.perf_counter()
+            translate(sentence)
+            latencies.append(time.perf_counter() - start)
+    return run
+
+
+def _whole(translate):
+    """Run a batch translate path once over all sentences (its latency is the whole call)."""
+    def run(sentences, latencies):
+        start = time.perf_counter()
+        translate(sentences)
+        latencies.append(time.perf_counter() - start)
+    return run
+
+
+def translate_paths(models, batch_sizes=BATCH_SIZES):
+    """
+    Every benchmarked path as {(backend, path, batch_size): (model name, run)}. batch_size is None for
+    per-sentence paths. `run(sentences, latencies)` translates the sentences and appends call latencies.
+    """
+    device = torch.device("cpu")
+    paths = {}
+    if "marian" in models:
+        model, tokenizer = models["marian"]
+        paths[("helsinki", "translate_text", None)] = ("marian", _each(
+            lambda text: load_helsinki.translate_text(model, tokenizer, text, device)))
+        for batch_size in batch_sizes:
+            paths[("helsinki", "translate_batch", batch_size)] = ("marian", _whole(
+                lambda texts, b=batch_size: load_helsinki.translate_batch(model, tokenizer, texts, device, batch_size=b)))
+    if "nllb" in models:
+        model, tokenizer = models["nllb"]
+        paths[("nllb", "translate_text", None)] = ("nllb", _each(
+            lambda text: load_NLLB.translate_text(model, tokenizer, text, "eng_Latn", "deu_Latn", device)))
+    if "m2m" in models:
+        model, tokenizer = models["m2m"]
+        paths[("m2m", "translate_text", None)] = ("m2m", _each(
+            lambda text: load_M2M.translate_text(model, tokenizer, text, "en", "de", device)))
+    if "small100" in models:
+        model, tokenizer = models["small100"]
+        paths[("small100", "translate_text", None)] = ("small100", _each(
+            lambda text: load_small100.translate_text(model, tokenizer, text, device)))
+    if "causal_lm" in models:
+        model, tokenizer = models["causal_lm"]
+        paths[("towerinstruct", "translate_text", None)] = ("causal_lm", _each(
+            lambda text: load_towerinstruct.translate_text(model, tokenizer, text, device, target_language="de")))
+        for batch_size in batch_sizes:
+            paths[("towerinstruct", "translate_batch", batch_size)] = ("causal_lm", _whole(
+                lambda texts, b=batch_size: load_towerinstruct.translate_batch(model, tokenizer, texts, "de", device, batch_size=b)))
+    return paths
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def run_suite(sentence_count=DEFAULT_SENTENCES, trials=DEFAULT_TRIALS, threads=None, only=None):
+    """Build the tiny models, run every translate path `trials` times after a warm-up and return one record per path."""
+    if threads:
+        torch.set_num_threads(threads)
+    sentences = tiny_models.sentences(sentence_count)
+    environment = {
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "transformers": transformers.__version__,
+        "machine": platform.machine(),
+        "threads": torch.get_num_threads(),
+    }
+
+    records = []
+    with tempfile.TemporaryDirectory() as tmp_dir, torch.no_grad():
+        models = tiny_models.build_models(tmp_dir)
+        for (backend, path, batch_size), (model_name, run) in translate_paths(models).items():
+            if only and backend not in only:
+                continue
+            print(f"⏱️ {backend}.{path}" + (f" (batch size {batch_size})" if batch_size else ""))
+            run(sentences[:2], [])  # Warm-up
+
+            trial_seconds, latencies = [], []
+            for _ in range(trials):
+                start = time.perf_counter()
+                run(sentences, latencies)
+                trial_seconds.append(time.perf_counter() - start)
+
+            records.append({
+                "suite": "throughput",
+                "backend": backend,
+                "model": f"tiny-{model_name}",
+                "stage": path,
+                "batch_size": batch_size,
+                "sentences": len(sentences),
+                "trial_seconds": trial_seconds,
+                "sentences_per_second": len(sentences) / statistics.median(trial_seconds),
+                "latency_p50_ms": _percentile(latencies, 0.5) * 1000,
+                "latency_p90_ms": _percentile(latencies, 0.9) * 1000,
+                "latency_p99_ms": _percentile(latencies, 0.99) * 1000,
+                **environment,
+            })
+    return records
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_records(path, records):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def print_records(records, baseline=None):
+    """Table of throughput and latency percentiles, with the ratio to a baseline run when one is given."""
+    base = {(r["backend"], r["stage"], r["batch_size"]): r for r in baseline or []}
+    print(f"{'path':<38}{'sent/s':>9}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'vs base':>9}")
+    for r in records:
+        name = f"{r['backend']}.{r['stage']}" + (f"[{r['batch_size']}]" if r["batch_size"] else "")
+        previous = base.get((r["backend"], r["stage"], r["batch_size"]))
+        ratio = f"{r['sentences_per_second'] / previous['sentences_per_second']:8.2f}x" if previous else f"{'-':>9}"
+        print(f"{name:<38}{r['sentences_per_second']:9.1f}{r['latency_p50_ms']:9.1f}{r['latency_p90_ms']:9.1f}"
+              f"{r['latency_p99_ms']:9.1f}{ratio}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the translate paths on tiny random models, offline.")
+    parser.add_argument("--sentences", type=int, default=DEFAULT_SENTENCES)
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS)
+    parser.add_argument("--threads", type=int, help="torch threads (default: torch's own choice)")
+    parser.add_argument("--backends", nargs="*", help="Only benchmark these backends, e.g. helsinki nllb")
+    parser.add_argument("--out", help="Write the run as JSONL to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline to compare against (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    args = parser.parse_args()
+
+    records = run_suite(args.sentences, args.trials, args.threads, args.backends)
+    baseline = read_records(args.baseline) if os.path.exists(args.baseline) else None
+    print_records(records, baseline)
+    if args.out:
+        write_records(args.out, records)
+        print(f"💾 Run written to {args.out}")
+    if args.save_baseline:
+        write_records(args.baseline, records)
+        print(f"💾 Baseline written to {args.baseline}")
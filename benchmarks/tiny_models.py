@@ -0,0 +1,158 @@
+"""
+Tiny randomly initialized models with locally trained tokenizers, for benchmarking the translate paths
+without the hub or real checkpoints. The outputs are gibberish; only the speed of the code around them matters.
+"""
+import json
+import os
+import random
+
+import sentencepiece as spm
+import torch
+from transformers import (
+    LlamaConfig, LlamaForCausalLM, LlamaTokenizer, M2M100Config, M2M100ForConditionalGeneration,
+    M2M100Tokenizer, MarianConfig, MarianMTModel, MarianTokenizer, NllbTokenizer,
+)
+from helpers.tokenization_small100 import SMALL100Tokenizer
+
+SEED = 0
+VOCAB_SIZE = 500  # SentencePiece pieces
+MAX_LENGTH = 32  # Generated tokens per sentence, random models rarely stop on their own
+
+# Same size for every architecture, so differences come from the code paths rather than the models
+MODEL_DIMENSIONS = {"d_model": 64, "layers": 2, "heads": 4, "ffn_dim": 128}
+
+# Chat template in the ChatML format TowerInstruct uses
+CHAT_TEMPLATE = (
+    "{% for message in messages %}<|im_start|>{{ message['role'] }}\n{{ message['content'] }}<|im_end|>\n{% endfor %}"
+    "{% if add_generation_prompt %}<|im_start|>assistant\n{% endif %}"
+)
+
+WORDS = (
+    "the a of to and in that is for it with as was on be by this are from at or an have not they which one you "
+    "were all we when there can more has their if will each about how up out them then she many some so these "
+    "would other into time two look more write go see number no way could people my than first water been call "
+    "who oil its now find long down day did get come made may part parliament council member state report"
+).split()
+
+
+def sentences(count=32, seed=SEED, min_words=4, max_words=40):
+    """Deterministic English-like sentences of varied length."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize() + "."
+            for _ in range(count)]
+
+
+def train_sentencepiece(out_dir):
+    """Train a small unigram SentencePiece model on generated text (unk=0, bos=1, eos=2) and return its path."""
+    corpus = os.path.join(out_dir, "corpus.txt")
+    with open(corpus, "w", encoding="utf-8") as f:
+        f.write("\n".join(sentences(2000, seed=SEED + 1)))
+    prefix = os.path.join(out_dir, "spm")
+    spm.SentencePieceTrainer.train(input=corpus, model_prefix=prefix, vocab_size=VOCAB_SIZE,
+                                   model_type="unigram", character_coverage=1.0, hard_vocab_limit=False,
+                                   num_threads=1, minloglevel=2)
+    return prefix + ".model"
+
+
+def _pieces(spm_path):
+    processor = spm.SentencePieceProcessor(model_file=spm_path)
+    return [processor.id_to_piece(i) for i in range(processor.get_piece_size())]
+
+
+def _write_vocab(out_dir, name, specials, spm_path):
+    """vocab.json with the special tokens first, then every SentencePiece piece."""
+    vocab = {token: i for i, token in enumerate(specials)}
+    for piece in _pieces(spm_path):
+        vocab.setdefault(piece, len(vocab))
+    path = os.path.join(out_dir, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(vocab, f)
+    return path
+
+
+def _limit_generation(model):
+    model.generation_config.max_length = MAX_LENGTH
+    return model.eval()
+
+
+def build_marian(out_dir, spm_path):
+    """Tiny Marian model (Helsinki-NLP architecture)."""
+    vocab_path = _write_vocab(out_dir, "marian_vocab.json", ["</s>", "<unk>", "<pad>"], spm_path)
+    tokenizer = MarianTokenizer(spm_path, spm_path, vocab_path)
+    d = MODEL_DIMENSIONS
+    config = MarianConfig(
+        vocab_size=len(tokenizer), d_model=d["d_model"], encoder_layers=d["layers"], decoder_layers=d["layers"],
+        encoder_attention_heads=d["heads"], decoder_attention_heads=d["heads"],
+        encoder_ffn_dim=d["ffn_dim"], decoder_ffn_dim=d["ffn_dim"], max_position_embeddings=256,
+        pad_token_id=tokenizer.pad_token_id, eos_token_id=tokenizer.eos_token_id,
+        decoder_start_token_id=tokenizer.pad_token_id, forced_eos_token_id=tokenizer.eos_token_id,
+    )
+    return _limit_generation(MarianMTModel(config)), tokenizer
+
+
+def _m2m_config(vocab_size):
+    d = MODEL_DIMENSIONS
+    return M2M100Config(
+        vocab_size=vocab_size, d_model=d["d_model"], encoder_layers=d["layers"], decoder_layers=d["layers"],
+        encoder_attention_heads=d["heads"], decoder_attention_heads=d["heads"],
+        encoder_ffn_dim=d["ffn_dim"], decoder_ffn_dim=d["ffn_dim"], max_position_embeddings=256,
+        bos_token_id=0, pad_token_id=1, eos_token_id=2, decoder_start_token_id=2,
+    )
+
+
+def build_m2m(out_dir, spm_path):
+    """Tiny M2M-100 model with an M2M100Tokenizer."""
+    vocab_path = _write_vocab(out_dir, "m2m_vocab.json", ["<s>", "<pad>", "</s>", "<unk>"], spm_path)
+    tokenizer = M2M100Tokenizer(vocab_path, spm_path)
+    return _limit_generation(M2M100ForConditionalGeneration(_m2m_config(len(tokenizer)))), tokenizer
+
+
+def build_small100(out_dir, spm_path, tgt_lang="de"):
+    """Tiny SMALL100 model: the M2M-100 architecture with the SMALL100 tokenizer."""
+    vocab_path = _write_vocab(out_dir, "small100_vocab.json", ["<s>", "<pad>", "</s>", "<unk>"], spm_path)
+    tokenizer = SMALL100Tokenizer(vocab_path, spm_path, tgt_lang=tgt_lang)
+    return _limit_generation(M2M100ForConditionalGeneration(_m2m_config(len(tokenizer)))), tokenizer
+
+
+def build_nllb(out_dir, spm_path):
+    """Tiny NLLB-200 model (M2M-100 architecture with the NLLB tokenizer and language codes)."""
+    tokenizer = NllbTokenizer(vocab_file=spm_path)
+    return _limit_generation(M2M100ForConditionalGeneration(_m2m_config(len(tokenizer)))), tokenizer
+
+
+def build_causal_lm(out_dir, spm_path):
+    """Tiny Llama-architecture causal LM standing in for TowerInstruct, with a ChatML chat template."""
+    tokenizer = LlamaTokenizer(vocab_file=spm_path, legacy=False)
+    tokenizer.pad_token = tokenizer.unk_token
+    tokenizer.padding_side = "left"  # As load_towerinstruct loads the real tokenizer
+    tokenizer.chat_template = CHAT_TEMPLATE
+    d = MODEL_DIMENSIONS
+    config = LlamaConfig(
+        vocab_size=len(tokenizer), hidden_size=d["d_model"], intermediate_size=d["ffn_dim"],
+        num_hidden_layers=d["layers"], num_attention_heads=d["heads"], num_key_value_heads=d["heads"],
+        max_position_embeddings=512, bos_token_id=tokenizer.bos_token_id, eos_token_id=tokenizer.eos_token_id,
+        pad_token_id=tokenizer.pad_token_id,
+    )
+    return _limit_generation(LlamaForCausalLM(config)), tokenizer
+
+
+BUILDERS = {
+    "marian": build_marian,
+    "m2m": build_m2m,
+    "small100": build_small100,
+    "nllb": build_nllb,
+    "causal_lm": build_causal_lm,
+}
+
+
+def build_models(out_dir, names=None):
+    """Build the requested tiny models with fixed seeds. Returns {name: (model, tokenizer)}."""
+    os.makedirs(out_dir, exist_ok=True)
+    spm_path = train_sentencepiece(out_dir)
+    models = {}
+    for name, build in BUILDERS.items():
+        if names and name not in names:
+            continue
+        torch.manual_seed(SEED)
+        models[name] = build(out_dir, spm_path)
+    return models
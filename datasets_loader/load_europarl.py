@@ -1,4 +1,6 @@
 from datasets import load_dataset, get_dataset_config_names
+from datasets_loader.sampling import shuffled_indices
+from datasets_loader.snapshot import load_snapshot
 
 BATCH_SIZE = 20
 
@@ -12,6 +14,11 @@ def load_europarl_data(target_language):
         if target_language == "get_languages":
             return EUROPARL_LANG_PAIRS
 
+        # Use the offline sample bundle if it has this language (skips the config lookup too)
+        snapshot = load_snapshot("Europarl", target_language)
+        if snapshot is not None:
+            return snapshot
+
         # Get available language pairs from dataset
         available_configs = get_dataset_config_names("Helsinki-NLP/europarl")
 
@@ -29,15 +36,17 @@ def load_europarl_data(target_language):
             raise ValueError(f"❌ No dataset found for {target_language} in either direction.")
 
         print(f"🟢 Loading dataset: {langpair}\n")
-        dataset = load_dataset("Helsinki-NLP/europarl", langpair, split="train", trust_remote_code=True).shuffle(seed=42)
+        dataset = load_dataset("Helsinki-NLP/europarl", langpair, split="train", trust_remote_code=True)
+
+        # Same rows as .shuffle(seed=42).select(range(BATCH_SIZE)), without an indices mapping for the whole split
+        indices = shuffled_indices(len(dataset), seed=42)[:BATCH_SIZE].tolist()
+        translations = dataset[indices]["translation"] if "translation" in dataset.column_names else []
 
         source_sentences = []
         reference_sentences = []
 
-        for item in dataset.select(range(BATCH_SIZE)):
-            if "translation" in item:
-                translation = item["translation"]
-
+        for translation in translations:
+            if translation:
                 # Extract correct language codes
                 src_lang, tgt_lang = langpair.split("-")
 
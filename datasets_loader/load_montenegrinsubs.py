@@ -1,33 +1,60 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from datasets import load_dataset
+from datasets_loader.sampling import shuffled_indices
+from datasets_loader.snapshot import load_snapshot
 
 BATCH_SIZE = 20
+MIN_WORDS = 11  # Keep sentences longer than 10 words
 
-def load_montenegrin_data(target_language):
+# A run of characters that str.split() would not split on (RE2 syntax)
+WORD_PATTERN = r"[^\s\x{0b}\x{1c}-\x{1f}\x{85}\pZ]+"
+
+def _field(translation, language):
+   """One language of the `translation` struct column, as a chunked Arrow array."""
+   return pa.chunked_array([chunk.field(language) for chunk in translation.chunks], type=translation.type.field(language).type)
+
+def load_montenegrin_data(target_language, sample_size=BATCH_SIZE, min_words=MIN_WORDS, max_words=None):
+   """
+   Load `sample_size` en-me subtitle pairs whose English side has between `min_words` and `max_words` words.
+   Word counts are computed for the whole split in Arrow, then the first matches in
+   shuffle(seed=42) order are taken, so the default selection is the same as walking the shuffled rows.
+   """
    try:
       if target_language != "cnr": return [], []
-      
+
+      # Use the offline sample bundle if it exists; it was exported with the default selection only
+      if (sample_size, min_words, max_words) == (BATCH_SIZE, MIN_WORDS, None):
+         snapshot = load_snapshot("Montenegrin", target_language)
+         if snapshot is not None:
+            return snapshot
+
       print(f"🟢 Loading dataset: Montenegrin\n")
-      dataset = load_dataset("Helsinki-NLP/opus_montenegrinsubs", split="train", trust_remote_code=True).shuffle(seed=42)
+      dataset = load_dataset("Helsinki-NLP/opus_montenegrinsubs", split="train", trust_remote_code=True)
+
+      translation = dataset.data.column("translation")
+      english = _field(translation, "en")
+      montenegrin = _field(translation, "me")
 
-      source_sentences = []
-      reference_sentences = []
+      word_counts = pc.fill_null(pc.count_substring_regex(english, WORD_PATTERN), 0)
+      mask = pc.and_(pc.greater_equal(word_counts, min_words), pc.is_valid(montenegrin))
+      if max_words is not None:
+         mask = pc.and_(mask, pc.less_equal(word_counts, max_words))
+      mask = np.asarray(mask.to_numpy(zero_copy_only=False), dtype=bool)
 
-      count = 0
-      i = 0
-      while count < BATCH_SIZE:
-         item = dataset[i]
-         i+=1
+      # Walk the rows in shuffle(seed=42) order and keep the first qualifying ones
+      order = shuffled_indices(len(dataset), seed=42)
+      selected = order[mask[order]][:sample_size].tolist()
+      if len(selected) < sample_size:
+         print(f"⚠️ Only {len(selected)} Montenegrin sentences match the length filter (wanted {sample_size}).")
 
-         if "translation" in item and "en" in item["translation"] and "me" in item["translation"]:
-            source = item["translation"]["en"]
-            if len(source.split()) > 10:
-               source_sentences.append(source)
-               reference_sentences.append(item["translation"]["me"])
-               count+=1
+      rows = dataset[selected]["translation"] if selected else []
+      source_sentences = [row["en"] for row in rows]
+      reference_sentences = [row["me"] for row in rows]
 
       return source_sentences, reference_sentences
 
    except Exception as e:
       print(f"❌ Error loading dataset for {target_language}: {e}")
       return [], []
-
@@ -1,11 +1,17 @@
 import json
 import re
 from datasets import load_dataset
+from datasets_loader.snapshot import load_snapshot
 
 def load_opus_data(language_pair):
     """
     Load test data for the given language pair from the OPUS dataset.
     """
+    # Use the offline sample bundle if it has this language pair
+    snapshot = load_snapshot("OPUS", language_pair)
+    if snapshot is not None:
+        return snapshot
+
     try:
         dataset = load_dataset("opus_books", language_pair)
     except ValueError:
@@ -18,8 +24,8 @@ def load_opus_data(language_pair):
         print(f"⚠️ Skipping {language_pair}: No usable split found.")
         return [], []
 
-    test_samples = list(dataset[split])[:1]  # Take 5 samples
-    sources = [sample["source"] for sample in test_samples]
-    references = [sample["target"] for sample in test_samples]
+    test_samples = dataset[split][:1]  # Take the first sample without converting the whole split
+    sources = test_samples["source"]
+    references = test_samples["target"]
     
     return sources, references
\ No newline at end of file
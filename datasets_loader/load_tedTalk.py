@@ -1,5 +1,8 @@
-import random
 from datasets import load_dataset, get_dataset_config_names
+from datasets_loader.sampling import random_sample_indices
+from datasets_loader.snapshot import load_snapshot
+
+BATCH_SIZE = 20
 
 
 TED_LANG_PAIRS = [ 
@@ -18,6 +21,11 @@ def load_tedTalk_data(target_lang_code, source_lang="en"):
     if target_lang_code == "get_languages":
         return TED_LANG_PAIRS
 
+    # Use the offline sample bundle if it has this language (skips the config lookup too)
+    snapshot = load_snapshot("TED", target_lang_code) if source_lang == "en" else None
+    if snapshot is not None:
+        return snapshot
+
     # Define dataset name
     dataset_name = "davidstap/ted_talks"
 
@@ -43,15 +51,13 @@ def load_tedTalk_data(target_lang_code, source_lang="en"):
         print(f"⚠️ No usable split found for {config_name}.")
         return [], []
 
-    # Shuffle TED Talk data
-    test_samples = list(dataset[split])
-    random.seed(42)
-    random.shuffle(test_samples)
-    test_samples = test_samples[:20]  # Limit to 5 test samples
+    # Sample TED Talk rows as a seeded shuffle would, reading only the selected rows
+    indices = random_sample_indices(len(dataset[split]), BATCH_SIZE, seed=42)
+    test_samples = dataset[split][indices]
 
     # Extract source and target translations
-    sources = [sample[source_lang] for sample in test_samples]
-    references = [sample[target_lang_code] for sample in test_samples]
+    sources = test_samples[source_lang]
+    references = test_samples[target_lang_code]
 
     return sources, references
 
@@ -1,5 +1,8 @@
-import random
 from datasets import load_dataset
+from datasets_loader.sampling import random_sample_indices
+from datasets_loader.snapshot import load_snapshot
+
+BATCH_SIZE = 20
 
 # Mapping of available WMT24PP language pairs (full locale names, change es_MX to es-ES if it exists)
 LANGUAGE_CODE_MAP = {
@@ -19,6 +22,11 @@ def load_wmt_data(language_pair):
     if language_pair == "get_languages":
         return list(LANGUAGE_CODE_MAP.keys())  # Return mapped full region codes
 
+    # Use the offline sample bundle if it has this language
+    snapshot = load_snapshot("WMT", language_pair)
+    if snapshot is not None:
+        return snapshot
+
     # Ensure language_pair is mapped to full region format if needed
     mapped_lang_pair = LANGUAGE_CODE_MAP.get(language_pair, language_pair)
     dataset_name = f"en-{mapped_lang_pair}"  # Adjusted dataset name
@@ -37,18 +45,11 @@ def load_wmt_data(language_pair):
         print(f"❌ No usable split found for {dataset_name}. Skipping...")
         return [], []
 
-    test_samples = list(dataset[split])
-
-    if not test_samples:
-        print(f"❌ No test samples found for {dataset_name}. Skipping...")
-        return [], []
-
-    # Shuffle dataset for randomness
-    random.seed(42)  # Ensures reproducibility
-    random.shuffle(test_samples)
-    test_samples = test_samples[:20]  # Take 5 shuffled samples
+    # Pick the same rows as shuffling with seed 42, but only read those rows from the Arrow table
+    indices = random_sample_indices(len(dataset[split]), BATCH_SIZE, seed=42)
+    test_samples = dataset[split][indices]
 
-    sources = [sample["source"] for sample in test_samples]
-    references = [sample["target"] for sample in test_samples]
+    sources = test_samples["source"]
+    references = test_samples["target"]
 
     return sources, references
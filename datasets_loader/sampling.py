@@ -0,0 +1,19 @@
+import random
+import numpy as np
+
+
+def shuffled_indices(num_rows, seed=42):
+    """
+    Row order produced by `Dataset.shuffle(seed=seed)`, without building the dataset's indices mapping.
+    """
+    return np.random.default_rng(seed).permutation(num_rows)
+
+
+def random_sample_indices(num_rows, sample_size, seed=42):
+    """
+    Indices of the first `sample_size` rows after `random.seed(seed); random.shuffle(rows)`.
+    The shuffle only depends on the number of rows, so shuffling indices selects the same rows.
+    """
+    indices = list(range(num_rows))
+    random.Random(seed).shuffle(indices)
+    return indices[:sample_size]
@@ -0,0 +1,160 @@
+"""
+Offline sample bundles for the dataset loaders.
+
+Export the exact samples every loader selects:
+    python -m datasets_loader.snapshot --out data/samples
+
+Loaders then read from the bundle (no hub access) whenever it contains the requested language.
+Set DATASET_SNAPSHOTS=0 to ignore the bundle and load from Hugging Face again.
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+SNAPSHOT_DIR = os.getenv("DATASET_SNAPSHOT_DIR", "data/samples")
+SNAPSHOTS_ENABLED = os.getenv("DATASET_SNAPSHOTS", "1") != "0"
+MANIFEST_FILE = "manifest.json"
+
+_manifests = {}
+
+
+def _read_manifest(snapshot_dir):
+    """Load (once) the manifest of a bundle, or None if there is no bundle."""
+    if snapshot_dir not in _manifests:
+        path = os.path.join(snapshot_dir, MANIFEST_FILE)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                _manifests[snapshot_dir] = json.load(f)
+        else:
+            _manifests[snapshot_dir] = None
+    return _manifests[snapshot_dir]
+
+
+def load_snapshot(dataset_name, language, snapshot_dir=None):
+    """
+    Return (sources, references) for a dataset/language from the local bundle,
+    or None if the bundle is missing, disabled, or does not contain that pair.
+    """
+    if not SNAPSHOTS_ENABLED:
+        return None
+
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    manifest = _read_manifest(snapshot_dir)
+    if manifest is None:
+        return None
+
+    relative_path = f"{dataset_name}/{language}.json"
+    entry = manifest["files"].get(relative_path)
+    if entry is None:
+        return None
+    if not entry.get("count"):
+        print(f"⚠️ Snapshot {relative_path} has no samples (failed export?), loading from the hub instead.")
+        return None
+
+    with open(os.path.join(snapshot_dir, relative_path), "rb") as f:
+        content = f.read()
+    if hashlib.sha256(content).hexdigest() != entry["sha256"]:
+        print(f"⚠️ Snapshot {relative_path} does not match its manifest hash, ignoring it.")
+        return None
+
+    sample = json.loads(content)
+    return sample["sources"], sample["references"]
+
+
+@contextmanager
+def snapshots_disabled():
+    """
+    Make the loaders skip the bundle inside the block, then restore the previous setting.
+    The flag is set on the imported datasets_loader.snapshot module, which is the one the loaders read
+    (not __main__ when this file runs as a script).
+    """
+    module = importlib.import_module("datasets_loader.snapshot")
+    previous = module.SNAPSHOTS_ENABLED
+    module.SNAPSHOTS_ENABLED = False
+    try:
+        yield
+    finally:
+        module.SNAPSHOTS_ENABLED = previous
+
+
+def _snapshot_sources(opus_pairs):
+    """Loader and languages to export for every dataset."""
+    from datasets_loader.load_europarl import load_europarl_data
+    from datasets_loader.load_montenegrinsubs import load_montenegrin_data
+    from datasets_loader.load_opus import load_opus_data
+    from datasets_loader.load_tedTalk import load_tedTalk_data
+    from datasets_loader.load_wmt import load_wmt_data
+
+    # Runners also ask every dataset for languages listed by the other datasets, so export the union
+    languages = []
+    for loader in (load_europarl_data, load_tedTalk_data, load_wmt_data):
+        for language in loader("get_languages"):
+            if language not in languages:
+                languages.append(language)
+
+    return {
+        "Europarl": (load_europarl_data, languages),
+        "TED": (load_tedTalk_data, languages),
+        "WMT": (load_wmt_data, languages),
+        "Montenegrin": (load_montenegrin_data, ["cnr"]),
+        "OPUS": (load_opus_data, opus_pairs),
+    }
+
+
+def export_snapshots(out_dir=None, dataset_names=None, opus_pairs=()):
+    """
+    Run every loader and write its selected samples plus a content-hash manifest to `out_dir`.
+    Empty samples (the loaders' result on hub or network errors) are reported and not written.
+    """
+    out_dir = out_dir or SNAPSHOT_DIR
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    manifest = {"files": {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    # Always export from the hub, never from an older bundle
+    failed = []
+    with snapshots_disabled():
+        for dataset_name, (loader, languages) in _snapshot_sources(list(opus_pairs)).items():
+            if dataset_names and dataset_name not in dataset_names:
+                continue
+            os.makedirs(os.path.join(out_dir, dataset_name), exist_ok=True)
+
+            for language in languages:
+                sources, references = loader(language)
+                relative_path = f"{dataset_name}/{language}.json"
+                if not sources or not references:
+                    # Loaders return ([], []) on hub or network errors, keep that out of the bundle
+                    kept = " (keeping the previous sample)" if manifest["files"].get(relative_path, {}).get("count") else ""
+                    print(f"⚠️ {relative_path}: no samples, not written{kept}")
+                    failed.append(relative_path)
+                    continue
+
+                content = json.dumps({"sources": sources, "references": references}, ensure_ascii=False).encode("utf-8")
+                with open(os.path.join(out_dir, relative_path), "wb") as f:
+                    f.write(content)
+                manifest["files"][relative_path] = {"sha256": hashlib.sha256(content).hexdigest(), "count": len(sources)}
+                print(f"💾 {relative_path}: {len(sources)} sample(s)")
+
+    manifest["created"] = datetime.now(timezone.utc).isoformat()
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    _manifests.pop(out_dir, None)
+    print(f"✅ Snapshot bundle written to {out_dir}")
+    if failed:
+        print(f"⚠️ {len(failed)} sample(s) could not be loaded and are not in the bundle, export them again "
+              f"once the hub is reachable: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export dataset samples to a local offline bundle.")
+    parser.add_argument("--out", default=SNAPSHOT_DIR, help="Bundle directory (default: %(default)s)")
+    parser.add_argument("--datasets", nargs="*", help="Only export these datasets (Europarl, TED, WMT, Montenegrin, OPUS)")
+    parser.add_argument("--opus-pairs", nargs="*", default=[], help="OPUS Books language pairs to export, e.g. en-fr")
+    args = parser.parse_args()
+    export_snapshots(args.out, args.datasets, args.opus_pairs)
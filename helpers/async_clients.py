@@ -0,0 +1,173 @@
+import asyncio
+import atexit
+import random
+import threading
+import time
+
+from helpers.cassettes import with_cassette
+
+# Per-provider limits: concurrent requests in flight and a token bucket of requests per second
+PROVIDER_LIMITS = {
+    "openai": {"concurrency": 8, "requests_per_second": 5.0, "burst": 10},
+    "gemini": {"concurrency": 4, "requests_per_second": 2.0, "burst": 4},
+    "google": {"concurrency": 16, "requests_per_second": 10.0, "burst": 20},
+}
+
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0  # Seconds, doubled on every attempt
+RETRY_MAX_DELAY = 30.0
+
+_loop = None
+_loop_lock = threading.Lock()
+_limiters = {}
+_latencies = {}  # provider -> list of (seconds, status), one per attempt
+_requests = {}  # provider -> {"requests": calls, "failed": calls that gave up, "retries": extra attempts}
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `capacity` requests."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def _limiter(provider):
+    """Semaphore and token bucket for a provider, created on the client event loop."""
+    if provider not in _limiters:
+        limits = PROVIDER_LIMITS[provider]
+        _limiters[provider] = (
+            asyncio.Semaphore(limits["concurrency"]),
+            TokenBucket(limits["requests_per_second"], limits["burst"]),
+        )
+    return _limiters[provider]
+
+
+def status_code(error):
+    """HTTP status carried by an SDK exception (OpenAI, google-api-core, httpx), if any."""
+    for value in (getattr(error, "status_code", None), getattr(error, "code", None)):
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None) or getattr(response, "status", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(error):
+    """Rate limits, server errors and dropped connections are worth retrying."""
+    status = status_code(error)
+    if status is not None:
+        return status == 429 or status >= 500
+    return isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError))
+
+
+def _retry_delay(error, attempt):
+    """Honour Retry-After when the server sends it, otherwise exponential backoff with full jitter."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None) or {}
+    retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    except (TypeError, ValueError):
+        return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+async def call(provider, request, cassette=None):
+    """
+    Run `request()` (a function returning an awaitable) under the provider's concurrency and rate limits,
+    retrying 429/5xx and connection errors with jittered backoff. Every attempt's latency is recorded,
+    and the call counts as one request however many attempts it took.
+    If `cassette` describes the request, the (JSON-serializable) response can be recorded or replayed,
+    see helpers.cassettes.
+    """
+    semaphore, bucket = _limiter(provider)
+    counts = _requests.setdefault(provider, {"requests": 0, "failed": 0, "retries": 0})
+    counts["requests"] += 1
+    for attempt in range(MAX_RETRIES + 1):
+        async with semaphore:
+            await bucket.acquire()
+            start = time.perf_counter()
+            try:
+                if cassette is None:
+                    result = await request()
+                else:
+                    result = await with_cassette(provider, cassette, request)
+            except Exception as e:
+                _latencies.setdefault(provider, []).append((time.perf_counter() - start, status_code(e) or type(e).__name__))
+                if attempt == MAX_RETRIES or not is_retryable(e):
+                    counts["failed"] += 1
+                    raise
+                error = e
+            else:
+                _latencies.setdefault(provider, []).append((time.perf_counter() - start, "ok"))
+                return result
+
+        counts["retries"] += 1
+        delay = _retry_delay(error, attempt)
+        print(f"⚠️ {provider} request failed ({status_code(error) or error}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+def _client_loop():
+    """One long-lived event loop shared by all API clients, so limits and connections persist across calls."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="api-clients", daemon=True).start()
+    return _loop
+
+
+def run(coroutine):
+    """Run a coroutine on the shared client loop from synchronous code and return its result."""
+    return asyncio.run_coroutine_threadsafe(coroutine, _client_loop()).result()
+
+
+async def _gather(coroutines):
+    return await asyncio.gather(*coroutines, return_exceptions=True)
+
+
+def run_all(coroutines):
+    """Run coroutines concurrently on the shared client loop; results (or exceptions) keep input order."""
+    return run(_gather(list(coroutines)))
+
+
+def in_thread(function, *args, **kwargs):
+    """Request factory for blocking SDK calls: runs `function` in a worker thread."""
+    return lambda: asyncio.to_thread(function, *args, **kwargs)
+
+
+def latency_stats():
+    """Per-provider requests, failed requests, retried attempts and p50/p95 attempt latency in seconds."""
+    stats = {}
+    for provider, samples in _latencies.items():
+        seconds = sorted(latency for latency, _ in samples)
+        stats[provider] = {
+            **_requests[provider],
+            "p50": seconds[len(seconds) // 2],
+            "p95": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))],
+        }
+    return stats
+
+
+def print_latency_stats():
+    """Print API request latency per provider for this run."""
+    for provider, stats in latency_stats().items():
+        print(f"🌐 {provider}: {stats['requests']} request(s), {stats['failed']} failed, {stats['retries']} retried attempt(s), "
+              f"p50 {stats['p50']:.2f}s, p95 {stats['p95']:.2f}s")
+
+
+atexit.register(print_latency_stats)
@@ -0,0 +1,208 @@
+from functools import lru_cache
+
+from helpers import async_clients
+from helpers.prompt_packing import PROMPT_FORMAT
+
+# Every backend is a dict of functions used by helpers.runner:
+#   translate(model_id, sentences, language, options) -> translations in input order
+#   params(model_id, language, options) -> decoding settings that go into the translation cache key
+#   target(model_id, language) -> target language code for the cache key, or None if unsupported
+#   local: True if the model is loaded in this process and should be released when the runner is done with it
+#   load(model_id, options): optional, loads a local model into the model cache so forked workers share its weights
+# Models are imported inside the functions so only the backends in use pull in their dependencies.
+# Helsinki, NLLB and M2M accept options["quantize"] ("int8", defaults to MODEL_QUANTIZATION from the environment).
+
+
+# Helsinki (Marian)
+def _helsinki_translate(model_id, sentences, language, options):
+    from models.load_helsinki import load_model, translate_batch
+    lang_id = options.get("lang_ids", {}).get(language, "")
+    model, tokenizer, device = load_model(model_id, options.get("quantize"))
+    return translate_batch(model, tokenizer, [f"{lang_id}{sentence}" for sentence in sentences], device)
+
+def _helsinki_load(model_id, options):
+    from models.load_helsinki import load_model
+    load_model(model_id, options.get("quantize"))
+
+def _helsinki_params(model_id, language, options):
+    from models.load_helsinki import GENERATION_PARAMS
+    params = {**GENERATION_PARAMS, "lang_id": options.get("lang_ids", {}).get(language, "")}
+    return _with_quantization(params, options)
+
+
+# NLLB-200
+def _nllb_translate(model_id, sentences, language, options):
+    from models.load_NLLB import load_model, translate_text, LANGUAGE_CODE_MAP
+    model, tokenizer, device = load_model(options.get("quantize"))
+    return [translate_text(model, tokenizer, src, "eng_Latn", LANGUAGE_CODE_MAP[language], device) for src in sentences]
+
+def _nllb_load(model_id, options):
+    from models.load_NLLB import load_model
+    load_model(options.get("quantize"))
+
+def _nllb_params(model_id, language, options):
+    from models.load_NLLB import GENERATION_PARAMS
+    return _with_quantization(GENERATION_PARAMS, options)
+
+def _nllb_target(model_id, language):
+    from models.load_NLLB import LANGUAGE_CODE_MAP
+    return LANGUAGE_CODE_MAP.get(language)
+
+
+# M2M-100
+def _m2m_translate(model_id, sentences, language, options):
+    from models.load_M2M import load_model, translate_text, LANGUAGE_CODE_MAP
+    model, tokenizer, device = load_model(options.get("quantize"))
+    return [translate_text(model, tokenizer, src, "en", LANGUAGE_CODE_MAP[language], device) for src in sentences]
+
+def _m2m_load(model_id, options):
+    from models.load_M2M import load_model
+    load_model(options.get("quantize"))
+
+def _m2m_params(model_id, language, options):
+    from models.load_M2M import GENERATION_PARAMS
+    return _with_quantization(GENERATION_PARAMS, options)
+
+def _m2m_target(model_id, language):
+    from models.load_M2M import LANGUAGE_CODE_MAP
+    return LANGUAGE_CODE_MAP.get(language)
+
+
+# SMALL100
+def _small100_translate(model_id, sentences, language, options):
+    from models.load_small100 import load_small100, translate_text
+    model, tokenizer, device = load_small100(language)
+    return [translate_text(model, tokenizer, sentence, device) for sentence in sentences]
+
+def _small100_load(model_id, options):
+    from models.load_small100 import load_small100
+    load_small100("en")  # The target language is set again before every translation
+
+def _small100_params(model_id, language, options):
+    from models.load_small100 import GENERATION_PARAMS
+    return GENERATION_PARAMS
+
+
+# TowerInstruct
+def _towerinstruct_translate(model_id, sentences, language, options):
+    from models.load_towerinstruct import load_towerinstruct, translate_batch, TOWERINSTRUCT_MODELS
+    parameters = {name: size for size, name in TOWERINSTRUCT_MODELS.items()}[model_id]
+    model, tokenizer, device = load_towerinstruct(parameters)
+    print(f"🔄 Translating {len(sentences)} sentence(s) to {language}...")
+    return translate_batch(model, tokenizer, sentences, language, device, batch_size=options.get("batch_size", 8))
+
+def _towerinstruct_load(model_id, options):
+    from models.load_towerinstruct import load_towerinstruct, TOWERINSTRUCT_MODELS
+    load_towerinstruct({name: size for size, name in TOWERINSTRUCT_MODELS.items()}[model_id])
+
+def _towerinstruct_params(model_id, language, options):
+    from models.load_towerinstruct import GENERATION_PARAMS, PROMPT_FORMAT, MAX_NEW_TOKENS, NEW_TOKENS_RATIO, NEW_TOKENS_SLACK
+    return {**GENERATION_PARAMS, "prompt": PROMPT_FORMAT,
+            "max_new_tokens": [NEW_TOKENS_RATIO, NEW_TOKENS_SLACK, MAX_NEW_TOKENS]}
+
+
+# CTranslate2 (Marian, NLLB-200 and M2M-100 checkpoints converted on first use)
+# options: compute_type, inter_threads, intra_threads and any TRANSLATE_PARAMS key (beam_size, batch_type, max_batch_size, ...)
+# No "load": CTranslate2 thread pools do not survive a fork, so every worker loads its own translator.
+CTRANSLATE2_LOAD_OPTIONS = ("compute_type", "inter_threads", "intra_threads")
+
+def _ctranslate2_family(model_id):
+    model_id = model_id.lower()
+    return "nllb" if "nllb" in model_id else "m2m" if "m2m100" in model_id else "helsinki"
+
+def _ctranslate2_translate(model_id, sentences, language, options):
+    from models.load_ctranslate2 import load_model, translate_batch, TRANSLATE_PARAMS
+    translator, tokenizer, device = load_model(model_id, **{k: v for k, v in options.items() if k in CTRANSLATE2_LOAD_OPTIONS})
+    params = {k: v for k, v in options.items() if k in TRANSLATE_PARAMS}
+    family = _ctranslate2_family(model_id)
+    if family == "nllb":
+        return translate_batch(translator, tokenizer, sentences, "eng_Latn", _nllb_target(model_id, language), **params)
+    if family == "m2m":
+        return translate_batch(translator, tokenizer, sentences, "en", _m2m_target(model_id, language), **params)
+    lang_id = options.get("lang_ids", {}).get(language, "")
+    return translate_batch(translator, tokenizer, [f"{lang_id}{sentence}" for sentence in sentences], **params)
+
+def _ctranslate2_params(model_id, language, options):
+    from models.load_ctranslate2 import TRANSLATE_PARAMS, COMPUTE_TYPE
+    params = {k: v for k, v in options.items() if k in TRANSLATE_PARAMS}
+    params = {**TRANSLATE_PARAMS, **params, "engine": "ctranslate2", "compute_type": options.get("compute_type", COMPUTE_TYPE)}
+    if _ctranslate2_family(model_id) == "helsinki":
+        params["lang_id"] = options.get("lang_ids", {}).get(language, "")
+    return params
+
+def _ctranslate2_target(model_id, language):
+    family = _ctranslate2_family(model_id)
+    if family == "nllb":
+        return _nllb_target(model_id, language)
+    if family == "m2m":
+        return _m2m_target(model_id, language)
+    return language
+
+
+# Gemini
+@lru_cache(maxsize=None)
+def _gemini_model():
+    from models.load_gemini import load_gemini
+    return load_gemini()
+
+def _gemini_translate(model_id, sentences, language, options):
+    from models.load_gemini import translate_batch_async
+    print(f"🔄 Prompting Gemini: Translating {len(sentences)} sentence(s) to {language}...")
+    return async_clients.run(translate_batch_async(_gemini_model(), sentences, language.split('-')[-1]))
+
+def _gemini_params(model_id, language, options):
+    return {"prompt": PROMPT_FORMAT}
+
+
+# ChatGPT
+@lru_cache(maxsize=None)
+def _chatgpt_client():
+    from models.load_chatgpt import load_chatgpt_async
+    return load_chatgpt_async()
+
+def _chatgpt_translate(model_id, sentences, language, options):
+    from models.load_chatgpt import translate_batch_async
+    return async_clients.run(translate_batch_async(_chatgpt_client(), sentences, language))
+
+def _chatgpt_params(model_id, language, options):
+    from models.load_chatgpt import GENERATION_PARAMS
+    return {**GENERATION_PARAMS, "prompt": PROMPT_FORMAT}
+
+
+# Google Cloud Translate
+@lru_cache(maxsize=None)
+def _google_client():
+    from models.load_googletranslate import load_google
+    return load_google()
+
+def _google_translate(model_id, sentences, language, options):
+    from models.load_googletranslate import translate_batch_async
+    return async_clients.run(translate_batch_async(_google_client(), sentences, language))
+
+
+def _with_quantization(params, options):
+    """Add the quantization to the cache params so int8 and fp32 translations are cached separately."""
+    import torch
+    from helpers.quantization import resolve_quantization
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    quantization = resolve_quantization(options.get("quantize"), device)
+    return {**params, "quantization": quantization} if quantization else params
+
+def _same_language(model_id, language):
+    return language
+
+def _no_params(model_id, language, options):
+    return {}
+
+
+BACKENDS = {
+    "helsinki": {"translate": _helsinki_translate, "params": _helsinki_params, "target": _same_language, "local": True, "load": _helsinki_load},
+    "nllb": {"translate": _nllb_translate, "params": _nllb_params, "target": _nllb_target, "local": True, "load": _nllb_load},
+    "m2m": {"translate": _m2m_translate, "params": _m2m_params, "target": _m2m_target, "local": True, "load": _m2m_load},
+    "small100": {"translate": _small100_translate, "params": _small100_params, "target": _same_language, "local": True, "load": _small100_load},
+    "ctranslate2": {"translate": _ctranslate2_translate, "params": _ctranslate2_params, "target": _ctranslate2_target, "local": True},
+    "towerinstruct": {"translate": _towerinstruct_translate, "params": _towerinstruct_params, "target": _same_language, "local": True, "load": _towerinstruct_load},
+    "gemini": {"translate": _gemini_translate, "params": _gemini_params, "target": _same_language, "local": False},
+    "chatgpt": {"translate": _chatgpt_translate, "params": _chatgpt_params, "target": _same_language, "local": False},
+    "google": {"translate": _google_translate, "params": _no_params, "target": _same_language, "local": False},
+}
@@ -0,0 +1,35 @@
+def length_buckets(lengths, batch_size=16, max_tokens=None):
+    """
+    Group item indices into batches of similar length.
+    Each batch holds at most `batch_size` items and, if `max_tokens` is set,
+    at most `max_tokens` padded tokens (batch size * longest item).
+    Longest items come first so memory problems show up on the first batch.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+    batches = []
+    current = []
+    longest = 0
+    for i in order:
+        length = max(lengths[i], 1)
+        padded = max(longest, length) * (len(current) + 1)
+        if current and (len(current) >= batch_size or (max_tokens and padded > max_tokens)):
+            batches.append(current)
+            current = []
+            longest = 0
+        current.append(i)
+        longest = max(longest, length)
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def budget_batch_size(lengths, batch_size=16, max_tokens=None):
+    """
+    Largest batch size, up to `batch_size`, whose batches stay within `max_tokens` padded tokens
+    even when they hold the longest item. For a single predict call with one fixed batch size.
+    """
+    if not max_tokens or not lengths:
+        return batch_size
+    return max(1, min(batch_size, max_tokens // max(max(lengths), 1)))
@@ -0,0 +1,75 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+# CASSETTE_MODE=record saves every API response, CASSETTE_MODE=replay serves them without network access.
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off")
+CASSETTE_DIR = os.getenv("CASSETTE_DIR", "data/cassettes")
+# Replay delay: unset for none, "recorded" for the latency seen while recording, or a number of seconds
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "")
+
+
+def replaying():
+    """True if API responses come from cassettes, so no credentials or network are needed."""
+    return CASSETTE_MODE == "replay"
+
+
+def _normalize(value):
+    """Canonical form of a request: tuples as lists, dict keys sorted when serialized. Text is kept as is."""
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def request_key(provider, request):
+    """Content address of a normalized request."""
+    payload = json.dumps([provider, _normalize(request)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cassette_path(provider, request):
+    key = request_key(provider, request)
+    return os.path.join(CASSETTE_DIR, provider, key[:2], f"{key}.json")
+
+
+def _replay_delay(recorded_latency):
+    if not CASSETTE_LATENCY:
+        return 0.0
+    if CASSETTE_LATENCY == "recorded":
+        return recorded_latency
+    return float(CASSETTE_LATENCY)
+
+
+async def with_cassette(provider, request, perform):
+    """
+    Return `await perform()` (a JSON-serializable response), recording it to or replaying it from
+    a cassette keyed by the normalized `request` description, depending on CASSETTE_MODE.
+    """
+    if CASSETTE_MODE not in ("record", "replay"):
+        return await perform()
+
+    path = cassette_path(provider, request)
+    if CASSETTE_MODE == "replay":
+        if not os.path.exists(path):
+            raise LookupError(f"No recorded {provider} response for this request ({path})")
+        with open(path, encoding="utf-8") as f:
+            cassette = json.load(f)
+        await asyncio.sleep(_replay_delay(cassette["latency"]))
+        return cassette["response"]
+
+    start = time.perf_counter()
+    response = await perform()
+    cassette = {"provider": provider, "request": _normalize(request), "response": response,
+                "latency": time.perf_counter() - start}
+
+    # Write atomically so concurrent recorders never leave a half-written cassette
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cassette, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+    return response
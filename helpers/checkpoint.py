@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+
+
+def journal_path(results_csv):
+    """The journal lives next to the results CSV it protects."""
+    return f"{results_csv}.journal"
+
+
+def _job_key(job):
+    return json.dumps([job["model"], job["dataset"], job["language"]], ensure_ascii=False)
+
+
+def _source_hash(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+
+
+class Journal:
+    """
+    Append-only JSONL log of a run's progress, keyed by (model, dataset, language, sentence index).
+
+    Every append is a single O_APPEND write followed by fsync, so a crash leaves at most one torn
+    final line, which is ignored on reload. Three kinds of records are written:
+      "translation": one translated sentence, so a restart resumes at the first missing sentence
+      "write": the CSV offsets right before a job's rows are written
+      "done": the job's rows are safely in the CSVs
+    A "write" without its "done" means the CSVs must be truncated back to the recorded offsets.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.translations = {}  # job key -> {index: (source hash, translation)}
+        self.done = set()
+        self.pending_write = None  # Offsets of a write that never finished
+        self.resuming = False
+
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from a crash
+                self.resuming = True
+                key = record["key"]
+                if record["event"] == "translation":
+                    self.translations.setdefault(key, {})[record["index"]] = (record["source"], record["translation"])
+                elif record["event"] == "write":
+                    self.pending_write = record["offsets"]
+                elif record["event"] == "done":
+                    self.done.add(key)
+                    self.pending_write = None
+
+    def _append(self, records):
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def completed_translations(self, job, sources):
+        """Translations already journaled for this job, as {index: translation}, if the source still matches."""
+        journaled = self.translations.get(_job_key(job), {})
+        return {
+            index: translation
+            for index, (source_hash, translation) in journaled.items()
+            if index < len(sources) and source_hash == _source_hash(sources[index])
+        }
+
+    def record_translations(self, job, indices, sources, translations):
+        """Journal freshly translated sentences of a job. Empty and "ERROR" translations are skipped so a resume retries them."""
+        key = _job_key(job)
+        records = []
+        for index, translation in zip(indices, translations):
+            if not translation or translation == "ERROR":
+                continue
+            source_hash = _source_hash(sources[index])
+            self.translations.setdefault(key, {})[index] = (source_hash, translation)
+            records.append({"event": "translation", "key": key, "index": index,
+                            "source": source_hash, "translation": translation})
+        if records:
+            self._append(records)
+
+    def is_done(self, job):
+        return _job_key(job) in self.done
+
+    def begin_write(self, job, offsets):
+        """Record the CSV sizes before a job's rows are written."""
+        self._append([{"event": "write", "key": _job_key(job), "offsets": offsets}])
+
+    def finish_write(self, job):
+        """Mark a job's rows as safely written."""
+        key = _job_key(job)
+        self._append([{"event": "done", "key": key}])
+        self.done.add(key)
+        self.translations.pop(key, None)
+
+    def remove(self):
+        """Delete the journal once the whole run has finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
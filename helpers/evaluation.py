@@ -1,18 +1,109 @@
+import atexit
+import hashlib
+import json
+import os
 import nltk
 import sacrebleu
-from comet.models import download_model, load_from_checkpoint
+from helpers.batching import budget_batch_size
+from helpers.sqlite_cache import connect, lookup
 
-# Download and load COMET model (for more accurate evaluation)
-COMET_MODEL_PATH = download_model("Unbabel/wmt22-comet-da")
-comet_model = load_from_checkpoint(COMET_MODEL_PATH)
+# COMET model (for more accurate evaluation), downloaded and loaded on first use
+COMET_MODEL_NAME = "Unbabel/wmt22-comet-da"
+COMET_MAX_TOKENS = 8192  # Padded src + mt + ref tokens per COMET batch
+COMET_MAX_BATCH_SIZE = 64
+
+# Per-segment COMET scores are cached on disk so unchanged triples are never rescored
+COMET_CACHE_PATH = os.getenv("COMET_CACHE_PATH", "data/cache/comet_scores.sqlite")
+COMET_CACHE_ENABLED = os.getenv("COMET_CACHE", "1") != "0"
+COMET_CACHE_SCHEMA = "CREATE TABLE IF NOT EXISTS comet_scores (key TEXT PRIMARY KEY, model TEXT, score REAL)"
+
+_comet_model = None
+_comet_cache_stats = {"hits": 0, "misses": 0}
+
+def get_comet_model():
+    """Download and load the COMET model the first time it is needed."""
+    global _comet_model
+    if _comet_model is None:
+        from comet.models import download_model, load_from_checkpoint
+        _comet_model = load_from_checkpoint(download_model(COMET_MODEL_NAME))
+    return _comet_model
+
+def _comet_lengths(model, data):
+    """Token count of each src + mt + ref triple, using the COMET encoder's tokenizer when available."""
+    tokenizer = getattr(model.encoder, "tokenizer", None)
+    lengths = [0] * len(data)
+    for field in ("src", "mt", "ref"):
+        texts = [sample[field] for sample in data]
+        if tokenizer is not None:
+            counts = [len(ids) for ids in tokenizer(texts)["input_ids"]]
+        else:
+            counts = [len(text.split()) for text in texts]
+        lengths = [total + count for total, count in zip(lengths, counts)]
+    return lengths
+
+def comet_cache_key(src, mt, ref):
+    """Content address of one scored segment: metric model and the (src, mt, ref) triple."""
+    payload = json.dumps([COMET_MODEL_NAME, src, mt, ref], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def print_comet_cache_stats():
+    """Print COMET score cache hits and misses for this run."""
+    hits, misses = _comet_cache_stats["hits"], _comet_cache_stats["misses"]
+    if hits + misses:
+        print(f"🗃️ COMET score cache: {hits} hit(s), {misses} segment(s) scored")
+
+atexit.register(print_comet_cache_stats)
 
 def compute_bleu(references, hypotheses):
     """Compute BLEU score using SacreBLEU"""
     bleu = sacrebleu.corpus_bleu(hypotheses, [references])
     return bleu.score
 
+def compute_comet_scores(references, hypotheses, sources):
+    """
+    Compute COMET scores in one length-batched predict call, with the batch size sized so that a batch
+    of the longest triples stays within COMET_MAX_TOKENS.
+    Segments already in the score cache are not rescored (and the model is not loaded if all are cached).
+    Returns the average score and the per-segment scores in input order.
+    """
+    data = [{"src": src, "mt": hyp, "ref": ref} for src, hyp, ref in zip(sources, hypotheses, references)]
+    if not data:
+        return 0.0, []
+    scores = [None] * len(data)
+
+    if COMET_CACHE_ENABLED:
+        conn = connect(COMET_CACHE_PATH, COMET_CACHE_SCHEMA)
+        keys = [comet_cache_key(sample["src"], sample["mt"], sample["ref"]) for sample in data]
+        found = lookup(conn, "comet_scores", "score", keys)
+        scores = [found.get(key) for key in keys]
+
+    missing = [i for i, score in enumerate(scores) if score is None]
+    _comet_cache_stats["hits"] += len(data) - len(missing)
+    _comet_cache_stats["misses"] += len(missing)
+
+    if missing:
+        import torch
+
+        model = get_comet_model()
+        gpus = 1 if torch.cuda.is_available() else 0
+        missing_data = [data[i] for i in missing]
+        batch_size = budget_batch_size(_comet_lengths(model, missing_data), COMET_MAX_BATCH_SIZE, COMET_MAX_TOKENS)
+
+        # One Trainer and dataloader for all segments, COMET sorts them by length and restores the order
+        output = model.predict(missing_data, batch_size=batch_size, gpus=gpus,
+                               progress_bar=False, length_batching=True)
+        for i, score in zip(missing, output.scores):
+            scores[i] = score
+
+        if COMET_CACHE_ENABLED:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO comet_scores VALUES (?, ?, ?)",
+                    [(keys[i], COMET_MODEL_NAME, scores[i]) for i in missing],
+                )
+
+    return sum(scores) / len(scores), scores  # Average score, per-segment scores
+
 def compute_comet(references, hypotheses, sources):
     """Compute COMET score for more accurate evaluation"""
-    data = [{"src": src, "mt": hyp, "ref": ref} for src, hyp, ref in zip(sources, hypotheses, references)]
-    comet_scores = comet_model.predict(data, batch_size=8)
-    return sum(comet_scores.scores) / len(comet_scores.scores)  # Average score
+    return compute_comet_scores(references, hypotheses, sources)[0]
@@ -0,0 +1,72 @@
+import argparse
+import os
+
+from huggingface_hub import scan_cache_dir
+
+from helpers.evaluation import COMET_MODEL_NAME
+
+# Disk budget for the Hugging Face hub cache, override with HF_CACHE_BUDGET_GB in the environment or .env
+HF_CACHE_BUDGET_GB = float(os.getenv("HF_CACHE_BUDGET_GB", "20"))
+
+# Never evicted: the COMET checkpoint and the encoder it is built on
+PINNED_MODELS = {COMET_MODEL_NAME, "xlm-roberta-large", "FacebookAI/xlm-roberta-large"}
+
+
+def _in_use():
+    """Model ids currently loaded in this process's model cache."""
+    from helpers.model_cache import cached_model_ids
+    return cached_model_ids()
+
+
+def enforce_budget(finished_model=None, budget_gb=None, keep=()):
+    """
+    Evict least recently used model snapshots from the Hugging Face hub cache until it fits the budget.
+
+    Only model repos are evicted: datasets, PINNED_MODELS, models still loaded in the model cache and
+    `keep` stay. Can be passed to run_matrix as `after_model`, which keeps the models of the jobs still pending
+    or running in worker processes and pipeline threads. Returns the number of bytes reclaimed.
+    """
+    budget = (HF_CACHE_BUDGET_GB if budget_gb is None else budget_gb) * 1024 ** 3
+    try:
+        info = scan_cache_dir()
+    except Exception as e:  # No cache yet, or an unreadable one
+        print(f"⚠️ Could not scan the Hugging Face cache: {e}")
+        return 0
+
+    size = info.size_on_disk
+    if size <= budget:
+        return 0
+
+    protected = PINNED_MODELS | set(_in_use()) | set(keep)
+    candidates = sorted(
+        (repo for repo in info.repos if repo.repo_type == "model" and repo.repo_id not in protected),
+        key=lambda repo: repo.last_accessed,
+    )
+
+    evicted, revisions = [], []
+    for repo in candidates:
+        if size <= budget:
+            break
+        evicted.append(repo.repo_id)
+        revisions.extend(revision.commit_hash for revision in repo.revisions)
+        size -= repo.size_on_disk
+
+    if not revisions:
+        print(f"⚠️ Hugging Face cache is {info.size_on_disk / 1024 ** 3:.1f} GB, over the {budget / 1024 ** 3:.0f} GB budget, "
+              f"but nothing can be evicted")
+        return 0
+
+    strategy = info.delete_revisions(*revisions)
+    strategy.execute()
+    print(f"🧹 Evicted {len(evicted)} model(s) from the Hugging Face cache ({', '.join(evicted)}), "
+          f"reclaimed {strategy.expected_freed_size / 1024 ** 3:.2f} GB"
+          + (f" after {finished_model}" if finished_model else ""))
+    return strategy.expected_freed_size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evict least recently used models from the Hugging Face cache.")
+    parser.add_argument("--budget-gb", type=float, default=HF_CACHE_BUDGET_GB, help="Disk budget (default: %(default)s)")
+    args = parser.parse_args()
+    reclaimed = enforce_budget(budget_gb=args.budget_gb)
+    print(f"✅ Reclaimed {reclaimed / 1024 ** 3:.2f} GB")
@@ -0,0 +1,146 @@
+import json
+import os
+import resource
+import threading
+import time
+
+# Per-stage timing of the hot paths, turn on with INSTRUMENTATION=1 in the environment or .env
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION", "0") == "1"
+
+# Timings are written next to the scores CSV: data/scores/x.csv -> data/scores/x.timings.jsonl
+TIMINGS_SUFFIX = ".timings.jsonl"
+
+_local = threading.local()  # Job the current thread is working on
+_lock = threading.Lock()
+_records = {}  # (model, dataset, language) -> {stage: totals}
+
+
+class _NoSpan:
+    """Shared do-nothing span returned while instrumentation is off; falsy so callers can skip counting tokens."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def add(self, tokens_in=0, tokens_out=0):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    """
+    Measures wall time and the process's CPU time of a `with` block and collects the token counts added to it.
+    CPU time includes torch's intra-op threads, so pipeline stages running at the same time share it.
+    process_peak_rss_mb is the process's lifetime peak when the block ends, not the block's own peak.
+    """
+
+    __slots__ = ("stage", "key", "tokens_in", "tokens_out", "wall", "cpu")
+
+    def __init__(self, stage, key):
+        self.stage = stage
+        self.key = key
+        self.tokens_in = 0
+        self.tokens_out = 0
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        process_peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+        with _lock:
+            totals = _records.setdefault(self.key, {}).setdefault(self.stage, {
+                "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "tokens_in": 0, "tokens_out": 0, "process_peak_rss_mb": 0.0})
+            totals["calls"] += 1
+            totals["wall_seconds"] += wall
+            totals["cpu_seconds"] += cpu
+            totals["tokens_in"] += self.tokens_in
+            totals["tokens_out"] += self.tokens_out
+            totals["process_peak_rss_mb"] = max(totals["process_peak_rss_mb"], process_peak_rss_mb)
+        return False
+
+    def __bool__(self):
+        return True
+
+    def add(self, tokens_in=0, tokens_out=0):
+        self.tokens_in += tokens_in
+        self.tokens_out += tokens_out
+
+
+def count_tokens(ids, tokenizer):
+    """Tokens in a tensor of ids, not counting padding, start, end or language tokens."""
+    import torch
+    special = torch.tensor(tokenizer.all_special_ids, device=ids.device)
+    return int((~torch.isin(ids, special)).sum())
+
+
+def enable(enabled=True):
+    """Turn instrumentation on or off at runtime (e.g. from a benchmark script)."""
+    global INSTRUMENTATION_ENABLED
+    INSTRUMENTATION_ENABLED = enabled
+
+
+def span(stage):
+    """
+    Context manager timing one stage for the current job. While instrumentation is off this returns a
+    shared no-op object, so a disabled span costs one function call.
+    """
+    if not INSTRUMENTATION_ENABLED:
+        return _NO_SPAN
+    return _Span(stage, getattr(_local, "job", None))
+
+
+def _job_key(job):
+    return (job["model"], job["dataset"], job["language"])
+
+
+def set_job(job):
+    """Attribute the spans of this thread to a (model, dataset, language) job."""
+    if INSTRUMENTATION_ENABLED:
+        _local.job = _job_key(job)
+
+
+def take_job(job):
+    """Remove and return a job's per-stage records, one dict per stage (empty while instrumentation is off)."""
+    with _lock:
+        stages = _records.pop(_job_key(job), {})
+    records = []
+    for stage, totals in stages.items():
+        wall = totals["wall_seconds"]
+        records.append({
+            "backend": job.get("backend"),
+            "model": job["model"],
+            "dataset": job["dataset"],
+            "language": job["language"],
+            "options": job.get("options", {}),
+            "stage": stage,
+            **totals,
+            "input_tokens_per_second": totals["tokens_in"] / wall if wall else None,
+            "output_tokens_per_second": totals["tokens_out"] / wall if wall else None,
+        })
+    return records
+
+
+def timings_path(results_csv):
+    root, _ = os.path.splitext(results_csv)
+    return root + TIMINGS_SUFFIX
+
+
+def write_records(path, records):
+    """Append records to a JSONL file."""
+    if not records:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
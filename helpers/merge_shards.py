@@ -0,0 +1,98 @@
+import argparse
+import csv
+import glob
+import os
+import re
+
+
+def find_shards(path):
+    """Per-shard files written next to `path` (x.shard1of4.csv, ...), ordered by shard index."""
+    root, ext = os.path.splitext(path)
+    pattern = re.compile(re.escape(root) + r"\.shard(\d+)of(\d+)" + re.escape(ext) + "$")
+    shards = []
+    for candidate in glob.glob(f"{glob.escape(root)}.shard*of*{ext}"):
+        match = pattern.match(candidate)
+        if match:
+            shards.append((int(match.group(2)), int(match.group(1)), candidate))
+    return [candidate for _, _, candidate in sorted(shards)]
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    return (rows[0], rows[1:]) if rows else (None, [])
+
+
+def _key_width(header):
+    """Rows are keyed by (Model Name,) Dataset, Language."""
+    return 3 if header and header[0] == "Model Name" else 2
+
+
+def merge_csv(path, sources):
+    """
+    Merge CSVs with the same header into `path`, one block of rows per (model, dataset, language) key.
+    For a key found in several sources, or several times in one appended-to source, the last block wins.
+    Keys are written in sorted order and rows within a key keep their order (sentence order for translations).
+    Returns the number of keys written.
+    """
+    header = None
+    blocks = {}
+    for source in sources:
+        source_header, rows = _read(source)
+        if source_header is None:
+            continue
+        if header is not None and source_header != header:
+            raise ValueError(f"{source} has header {source_header}, expected {header}")
+        header = source_header
+        width = _key_width(header)
+
+        source_blocks = {}
+        last_key = None
+        for row in rows:
+            key = tuple(row[:width])
+            if key != last_key:
+                source_blocks[key] = []  # A key seen again later in the file is a rerun that replaces it
+                last_key = key
+            source_blocks[key].append(row)
+        blocks.update(source_blocks)
+
+    if header is None:
+        raise ValueError(f"Nothing to merge into {path}")
+
+    tmp_path = path + ".tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for key in sorted(blocks):
+            writer.writerows(blocks[key])
+    os.replace(tmp_path, path)
+    return len(blocks)
+
+
+def merge_shards(results_csv, translations_csv, replace=False, remove_shards=False):
+    """
+    Combine the per-shard score and translation CSVs of a sharded run into the canonical files.
+    Unless `replace` is set, rows already in the canonical files are kept where no shard has a newer result.
+    """
+    for path in (results_csv, translations_csv):
+        shards = find_shards(path)
+        if not shards:
+            print(f"⚠️ No shard files found for {path}")
+            continue
+        sources = ([] if replace or not os.path.exists(path) else [path]) + shards
+        keys = merge_csv(path, sources)
+        print(f"✅ Merged {len(shards)} shard file(s) into {path} ({keys} model/dataset/language key(s))")
+        if remove_shards:
+            for shard in shards:
+                os.remove(shard)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge the per-shard CSVs of a `--shard i/N` run into the canonical CSVs.")
+    parser.add_argument("results_csv", help="Canonical scores CSV, e.g. data/scores/M2M100_test_results.csv")
+    parser.add_argument("translations_csv", help="Canonical translations CSV, e.g. data/translations/M2M100_translations.csv")
+    parser.add_argument("--replace", action="store_true", help="Ignore rows already in the canonical files")
+    parser.add_argument("--remove-shards", action="store_true", help="Delete the shard files after merging")
+    args = parser.parse_args()
+    merge_shards(args.results_csv, args.translations_csv, args.replace, args.remove_shards)
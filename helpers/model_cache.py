@@ -0,0 +1,134 @@
+import atexit
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from helpers.instrumentation import span
+
+# RAM budget for cached models, override with MODEL_CACHE_BUDGET_GB in the environment or .env
+MODEL_CACHE_BUDGET_GB = float(os.getenv("MODEL_CACHE_BUDGET_GB", "8"))
+
+_cache = OrderedDict()  # (model_id, dtype, device) -> (model, tokenizer, size in bytes)
+_stats = {}  # model_id -> {"loads", "load_seconds", "hits"}
+_pinned = set()  # Keys never evicted by the LRU (models shared with forked workers)
+_lock = threading.RLock()  # Pipeline runs load, release and score models from different threads
+
+
+def model_size_bytes(model):
+    """Approximate memory used by a model's parameters and buffers."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def get_model(model_id, loader, dtype="float32", device="cpu", size_fn=model_size_bytes):
+    """
+    Return a cached (model, tokenizer) pair, calling `loader()` only on the first request.
+    Least recently used entries are evicted once the cache exceeds MODEL_CACHE_BUDGET_GB.
+    `size_fn(model)` measures non-torch models (e.g. CTranslate2 translators).
+    """
+    key = (model_id, str(dtype), str(device))
+    with _lock:
+        stats = _stats.setdefault(model_id, {"loads": 0, "load_seconds": 0.0, "hits": 0})
+
+        if key in _cache:
+            _cache.move_to_end(key)
+            stats["hits"] += 1
+            model, tokenizer, _ = _cache[key]
+            return model, tokenizer
+
+        start = time.perf_counter()
+        with span("model_load"):
+            model, tokenizer = loader()
+        stats["loads"] += 1
+        stats["load_seconds"] += time.perf_counter() - start
+
+        _cache[key] = (model, tokenizer, size_fn(model))
+        _evict_over_budget()
+    return model, tokenizer
+
+
+def cached_size():
+    """Bytes held by the cached models."""
+    with _lock:
+        return sum(size for _, _, size in _cache.values())
+
+
+def _evict_over_budget():
+    """Drop least recently used unpinned models until the cache fits the budget (the newest entry always stays)."""
+    budget = MODEL_CACHE_BUDGET_GB * 1024 ** 3
+    evicted = False
+    with _lock:
+        while cached_size() > budget:
+            candidates = [key for key in list(_cache)[:-1] if key not in _pinned]
+            if not candidates:
+                break
+            model_id, dtype, device = candidates[0]
+            del _cache[candidates[0]]
+            print(f"♻️ Evicting {model_id} ({dtype}, {device}) from model cache")
+            evicted = True
+    if evicted:
+        _free_memory()
+
+
+def release_model(model_id=None):
+    """
+    Remove a model (every dtype/device variant) from the cache, or all models if no id is given.
+    Memory is only returned once callers drop their own references too.
+    """
+    with _lock:
+        for key in list(_cache):
+            if model_id is None or key[0] == model_id:
+                del _cache[key]
+                _pinned.discard(key)
+    _free_memory()
+
+
+def _free_memory():
+    import torch  # Only needed here, so the cache itself works without torch (e.g. in unit tests)
+    gc.collect()
+    if torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+
+def pin_cached_models():
+    """
+    Keep every cached CPU model out of LRU eviction, so processes forked afterwards keep reading
+    the parent's copy-on-write pages instead of reloading a private copy. Returns the pinned size in bytes.
+    """
+    pinned = 0
+    with _lock:
+        for key, (model, _, size) in _cache.items():
+            if key[2] != "cpu":
+                continue
+            if hasattr(model, "eval"):
+                model.eval()
+            _pinned.add(key)
+            pinned += size
+    return pinned
+
+
+def cached_model_ids():
+    """Ids of the models currently held in the cache."""
+    with _lock:
+        return {model_id for model_id, _, _ in _cache}
+
+
+def model_cache_stats():
+    """Return load counts, load seconds and cache hits per model id."""
+    with _lock:
+        return {model_id: dict(stats) for model_id, stats in _stats.items()}
+
+
+def print_model_cache_stats():
+    """Print a summary of model loads for this run."""
+    stats_by_model = model_cache_stats()
+    if not stats_by_model:
+        return
+    print("📦 Model cache summary:")
+    for model_id, stats in stats_by_model.items():
+        print(f"   {model_id}: {stats['loads']} load(s), {stats['load_seconds']:.1f}s loading, {stats['hits']} cache hit(s)")
+
+
+atexit.register(print_model_cache_stats)
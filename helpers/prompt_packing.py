@@ -0,0 +1,123 @@
+import asyncio
+import json
+import re
+
+# Version of the prompt format, part of the translation cache key of LLM backends
+PROMPT_FORMAT = "json-ids-v1"
+
+PACK_MAX_TOKENS = 1500  # Estimated source tokens per request, for backends without a reply limit (see pack_max_tokens)
+PACK_MAX_ITEMS = 40
+MAX_ROUNDS = 3  # First request plus re-requests for missing or malformed ids, each with packs half the size
+
+# Reply tokens per source token: translations can run longer than the English source, plus the JSON around each item
+REPLY_EXPANSION = 2
+
+INSTRUCTIONS = (
+    "Translate the \"text\" of every item from English to {language}. "
+    "Reply with only a JSON object of the form "
+    "{{\"translations\": [{{\"id\": <id>, \"translation\": \"<translated text>\"}}, ...]}} "
+    "containing exactly one entry for every id below, in any order.\n\n{items}"
+)
+
+
+def estimate_tokens(text):
+    """Rough token count (about 3 characters per token), no tokenizer needed."""
+    return len(text) // 3 + 1
+
+
+def pack_max_tokens(reply_max_tokens):
+    """Source tokens per request whose reply fits a backend's `reply_max_tokens` limit."""
+    return max(reply_max_tokens // REPLY_EXPANSION, 1)
+
+
+def pack_requests(items, max_tokens=PACK_MAX_TOKENS, max_items=PACK_MAX_ITEMS):
+    """Group (id, sentence) pairs into requests of at most `max_items` items and about `max_tokens` tokens."""
+    packs = []
+    current = []
+    current_tokens = 0
+    for item_id, sentence in items:
+        tokens = estimate_tokens(sentence)
+        if current and (len(current) >= max_items or current_tokens + tokens > max_tokens):
+            packs.append(current)
+            current = []
+            current_tokens = 0
+        current.append((item_id, sentence))
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    return packs
+
+
+def build_prompt(pack, target_language):
+    """Numbered JSON request for one pack of sentences."""
+    items = json.dumps([{"id": item_id, "text": sentence} for item_id, sentence in pack], ensure_ascii=False)
+    return INSTRUCTIONS.format(language=target_language, items=items)
+
+
+def parse_reply(reply, expected_ids):
+    """
+    Extract {id: translation} from a model reply, keeping only expected ids with a non-empty string translation.
+    Tolerates Markdown code fences and text around the JSON. If the reply is truncated or partly malformed,
+    the complete {"id": ..., "translation": ...} entries are kept. Returns {} if none can be read.
+    """
+    match = re.search(r"[\[{].*[\]}]", reply or "", re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        data = _complete_entries(match.group(0))
+
+    entries = data.get("translations", []) if isinstance(data, dict) else data
+    translations = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        item_id, translation = entry.get("id"), entry.get("translation")
+        if isinstance(item_id, str) and item_id.isdigit():
+            item_id = int(item_id)
+        if item_id in expected_ids and item_id not in translations and isinstance(translation, str) and translation.strip():
+            translations[item_id] = translation.strip()
+    return translations
+
+
+def _complete_entries(text):
+    """Entries of a reply that is not valid JSON as a whole: every flat JSON object that parses on its own."""
+    entries = []
+    for match in re.finditer(r"\{[^{}]*\}", text):
+        try:
+            entries.append(json.loads(match.group(0)))
+        except json.JSONDecodeError:
+            continue
+    return entries
+
+
+async def translate_packed(sentences, target_language, send, max_tokens=PACK_MAX_TOKENS, max_items=PACK_MAX_ITEMS,
+                           max_rounds=MAX_ROUNDS):
+    """
+    Translate sentences with as few LLM requests as possible without misaligning them.
+    `send(prompt)` is an async function returning the model's reply text. Every sentence gets an id,
+    replies are validated against those ids, and only missing or malformed ids are requested again,
+    in packs half the size of the previous round's so a reply that overflowed its limit fits next time.
+    Sentences still missing after `max_rounds` come back as "ERROR".
+    """
+    translations = {}
+    pending = list(enumerate(sentences, start=1))
+
+    for round_number in range(max_rounds):
+        if not pending:
+            break
+        if round_number:
+            print(f"⚠️ Re-requesting {len(pending)} missing or malformed translation(s) to {target_language}")
+
+        packs = pack_requests(pending, max(max_tokens >> round_number, 1), max(max_items >> round_number, 1))
+        replies = await asyncio.gather(*(send(build_prompt(pack, target_language)) for pack in packs), return_exceptions=True)
+        for pack, reply in zip(packs, replies):
+            if isinstance(reply, Exception):
+                print(f"⚠️ Translation request failed: {reply}")
+                continue
+            translations.update(parse_reply(reply, {item_id for item_id, _ in pack}))
+
+        pending = [(item_id, sentence) for item_id, sentence in pending if item_id not in translations]
+
+    return [translations.get(item_id, "ERROR") for item_id in range(1, len(sentences) + 1)]
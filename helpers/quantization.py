@@ -0,0 +1,36 @@
+import os
+
+import torch
+
+# Default weight quantization for the local seq2seq models ("int8" or empty for fp32), override with MODEL_QUANTIZATION
+MODEL_QUANTIZATION = os.getenv("MODEL_QUANTIZATION", "").lower()
+
+SUPPORTED_QUANTIZATIONS = ("int8",)
+
+
+def resolve_quantization(quantize, device):
+    """
+    Return the quantization to apply ("int8" or None), falling back to MODEL_QUANTIZATION when `quantize` is None.
+    Dynamic int8 quantization only runs on CPU, so it is ignored with a warning on GPU.
+    """
+    if quantize is None:
+        quantize = MODEL_QUANTIZATION
+    if not quantize or quantize in ("fp32", "float32", "none"):
+        return None
+    if quantize not in SUPPORTED_QUANTIZATIONS:
+        raise ValueError(f"Unsupported quantization {quantize!r}, expected one of {SUPPORTED_QUANTIZATIONS}")
+    if str(device) != "cpu":
+        print(f"⚠️ {quantize} quantization is CPU only, keeping fp32 weights on {device}")
+        return None
+    return quantize
+
+
+def quantize_int8(model):
+    """Replace the model's Linear layers with dynamically quantized int8 versions (activations stay float)."""
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def model_dtype(quantization):
+    """Model cache dtype key for a resolved quantization."""
+    return quantization or "float32"
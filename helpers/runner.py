@@ -0,0 +1,554 @@
+import csv
+import gc
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from helpers.backends import BACKENDS
+from helpers.checkpoint import Journal, journal_path
+from helpers.evaluation import compute_bleu, compute_comet, get_comet_model
+from helpers.instrumentation import set_job, span, take_job, timings_path, write_records
+from helpers.model_cache import MODEL_CACHE_BUDGET_GB, cached_size, pin_cached_models, release_model
+from helpers.sharding import assign_shards, shard_from_argv, shard_path
+from helpers.translation_cache import cached_translate
+from datasets_loader.load_europarl import load_europarl_data
+from datasets_loader.load_montenegrinsubs import load_montenegrin_data
+from datasets_loader.load_opus import load_opus_data
+from datasets_loader.load_tedTalk import load_tedTalk_data
+from datasets_loader.load_wmt import load_wmt_data
+
+# Dataset names as they appear in the CSVs
+DATASET_LOADERS = {
+    "Europarl": load_europarl_data,
+    "TED": load_tedTalk_data,
+    "WMT": load_wmt_data,
+    "montenegrin": load_montenegrin_data,
+    "OPUS": load_opus_data,
+}
+
+# Datasets whose loader returns its language list for "get_languages"; matrix entries for the others need "languages"
+LISTS_LANGUAGES = {"Europarl", "TED", "WMT"}
+
+# Worker processes used by run_matrix, override with RUNNER_WORKERS in the environment or .env (1 = no pool)
+RUNNER_WORKERS = int(os.getenv("RUNNER_WORKERS", "1"))
+
+# Load models once in the main process and share their weights with the workers, override with RUNNER_SHARE_WEIGHTS=0
+RUNNER_SHARE_WEIGHTS = os.getenv("RUNNER_SHARE_WEIGHTS", "1") != "0"
+
+# Overlap dataset loading, generation, scoring and writing in one process, override with RUNNER_PIPELINE=1
+RUNNER_PIPELINE = os.getenv("RUNNER_PIPELINE", "0") == "1"
+PIPELINE_QUEUE_SIZE = int(os.getenv("RUNNER_PIPELINE_QUEUE", "2"))  # Jobs waiting between two stages
+
+RESULTS_HEADER = ["Dataset", "Language", "BLEU", "COMET"]
+TRANSLATIONS_HEADER = ["Dataset", "Language", "Source Sentence", "Translation", "Reference Sentence"]
+
+_samples = {}
+
+
+def plan_jobs(matrix):
+    """
+    Expand a declarative matrix into one job per (backend, model, dataset, language).
+
+    Each matrix entry is a dict with "backend" (a key of helpers.backends.BACKENDS), "model",
+    "datasets" (keys of DATASET_LOADERS), optional "languages" (defaults to each dataset's own
+    language list, required for datasets not in LISTS_LANGUAGES) and optional "options" passed to the backend.
+    Duplicate jobs are dropped and jobs are grouped by model so every model is loaded once.
+    """
+    jobs = []
+    seen = set()
+    for entry in matrix:
+        backend = BACKENDS[entry["backend"]]
+        for dataset_name in entry["datasets"]:
+            languages = entry.get("languages") or dataset_languages(dataset_name)
+            for language in languages:
+                key = (entry["backend"], entry["model"], dataset_name, language)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if backend["target"](entry["model"], language) is None:
+                    print(f"⚠️ Skipping {language}: No mapping found for {entry['model']}.")
+                    continue
+                jobs.append({
+                    "backend": entry["backend"],
+                    "model": entry["model"],
+                    "dataset": dataset_name,
+                    "language": language,
+                    "options": entry.get("options", {}),
+                })
+
+    model_order = {}
+    for job in jobs:
+        model_order.setdefault((job["backend"], job["model"]), len(model_order))
+    jobs.sort(key=lambda job: model_order[(job["backend"], job["model"])])  # Stable, keeps dataset/language order
+    return jobs
+
+
+def dataset_languages(dataset_name):
+    """Language list of a dataset, for matrix entries without "languages"."""
+    if dataset_name not in LISTS_LANGUAGES:
+        raise ValueError(f"{dataset_name} cannot list its languages, set \"languages\" in its matrix entry")
+    languages = DATASET_LOADERS[dataset_name]("get_languages")
+    if not isinstance(languages, list) or not all(isinstance(language, str) for language in languages):
+        raise ValueError(f"{dataset_name} returned {languages!r} for its languages, set \"languages\" in its matrix entry")
+    return languages
+
+
+def load_samples(dataset_name, language):
+    """Fetch a dataset sample once per run and reuse it for every model."""
+    key = (dataset_name, language)
+    if key not in _samples:
+        _samples[key] = DATASET_LOADERS[dataset_name](language)
+    return _samples[key]
+
+
+def translate_job(job, sources, journal=None):
+    """
+    Translate a job's sources, going through the translation cache.
+    With a journal, sentences it already holds are reused and the rest are journaled as soon as the backend returns them.
+    All missing sentences go to the backend in one call, so packed and batched requests are never split for the journal.
+    """
+    backend = BACKENDS[job["backend"]]
+    model_id, language, options = job["model"], job["language"], job["options"]
+    params = backend["params"](model_id, language, options)
+    target = backend["target"](model_id, language)
+
+    completed = journal.completed_translations(job, sources) if journal else {}
+    hypotheses = [completed.get(i) for i in range(len(sources))]
+    missing = [i for i, hypothesis in enumerate(hypotheses) if hypothesis is None]
+    if completed and missing:
+        print(f"↩️ Resuming {model_id} | {job['dataset']} | {language} at sentence {missing[0] + 1}/{len(sources)}")
+
+    if missing:
+        translations = cached_translate(
+            model_id, params, target, [sources[i] for i in missing],
+            lambda todo: backend["translate"](model_id, todo, language, options),
+        )
+        for i, translation in zip(missing, translations):
+            hypotheses[i] = translation
+        if journal:
+            journal.record_translations(job, missing, sources, translations)
+
+    return hypotheses
+
+
+def run_job(job, journal=None):
+    """Load, translate and score one job. Returns the job with its status, sentences and scores."""
+    return score_stage(generate_stage(load_stage({**job, "status": None}), journal))
+
+
+# A job result moves through the stages below; once a stage sets "status" the later ones pass it through.
+
+def _stage(fn):
+    def stage(result, *args):
+        if result["status"] is not None:
+            return result
+        set_job(result)
+        try:
+            return fn(result, *args)
+        except Exception as e:
+            print(f"❌ Error for {result['model']} | {result['dataset']} | {result['language']}: {e}")
+            return {**result, "status": "error", "error": str(e)}
+    stage.__doc__ = fn.__doc__
+    return stage
+
+
+@_stage
+def load_stage(result):
+    """Fetch the job's dataset sample."""
+    with span("dataset_load"):
+        sources, references = load_samples(result["dataset"], result["language"])
+    if not sources or not references:
+        print(f"⚠️ No data for {result['language']} in {result['dataset']}, skipping.")
+        return {**result, "status": "no_data"}
+    return {**result, "sources": sources, "references": references}
+
+
+@_stage
+def generate_stage(result, journal=None):
+    """Translate the job's sources."""
+    return {**result, "hypotheses": translate_job(result, result["sources"], journal)}
+
+
+@_stage
+def score_stage(result):
+    """Compute BLEU and COMET for the job's translations."""
+    references, hypotheses = result["references"], result["hypotheses"]
+    with span("bleu"):
+        bleu = compute_bleu(references, hypotheses)
+    with span("comet"):
+        comet = compute_comet(references, hypotheses, result["sources"])
+    print(f"✅ {result['model']} | {result['dataset']} | {result['language']} -> BLEU: {bleu}, COMET: {comet}")
+    return {**result, "status": "ok", "bleu": bleu, "comet": comet}
+
+
+class ResultWriter:
+    """Appends job results to a scores CSV and a translations CSV, in the layout the runners always used."""
+
+    def __init__(self, results_csv, translations_csv, model_column=False, mode="a",
+                 missing_value="NA", error_value="Error"):
+        self.model_column = model_column
+        self.missing_value = missing_value
+        self.error_value = error_value
+        self.paths = (results_csv, translations_csv)
+
+        for path in (results_csv, translations_csv):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.results_file = open(results_csv, mode=mode, newline="", encoding="utf-8")
+        self.translations_file = open(translations_csv, mode=mode, newline="", encoding="utf-8")
+        self.results_writer = csv.writer(self.results_file)
+        self.translations_writer = csv.writer(self.translations_file)
+
+        # Write headers only if the files are new
+        prefix = ["Model Name"] if model_column else []
+        if self.results_file.tell() == 0:
+            self.results_writer.writerow(prefix + RESULTS_HEADER)
+        if self.translations_file.tell() == 0:
+            self.translations_writer.writerow(prefix + TRANSLATIONS_HEADER)
+
+    def _row(self, result, values):
+        prefix = [result["model"]] if self.model_column else []
+        return prefix + [result["dataset"], result["language"]] + values
+
+    def offsets(self):
+        """Current size of both CSV files, used to roll back a half-written job."""
+        return {path: f.tell() for path, f in zip(self.paths, (self.results_file, self.translations_file))}
+
+    def write(self, result):
+        """Write one job result and fsync so a crash never loses finished work."""
+        if result["status"] == "ok":
+            self.results_writer.writerow(self._row(result, [round(result["bleu"], 2), round(result["comet"], 2)]))
+            for src, hyp, ref in zip(result["sources"], result["hypotheses"], result["references"]):
+                self.translations_writer.writerow(self._row(result, [src, hyp, ref]))
+            self.translations_file.flush()
+        else:
+            value = self.missing_value if result["status"] == "no_data" else self.error_value
+            self.results_writer.writerow(self._row(result, [value, value]))
+        self.results_file.flush()
+        for f in (self.results_file, self.translations_file):
+            os.fsync(f.fileno())
+
+    def close(self):
+        self.results_file.close()
+        self.translations_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def completed_jobs(results_csv, model_column=False):
+    """(model, dataset, language) keys that already have a row in the results CSV."""
+    completed = set()
+    if os.path.exists(results_csv):
+        with open(results_csv, mode="r", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # skip header
+            for row in reader:
+                if model_column and len(row) >= 3:
+                    completed.add((row[0], row[1], row[2]))
+                elif not model_column and len(row) >= 2:
+                    completed.add((None, row[0], row[1]))
+    return completed
+
+
+def run_matrix(matrix, results_csv, translations_csv, model_column=False, mode="a",
+               missing_value="NA", error_value="Error", skip_completed=False, after_model=None, workers=None,
+               share_weights=None, shard=None, pipeline=None):
+    """
+    Run every job of an evaluation matrix and stream the results to the CSV files.
+
+    Jobs are executed model by model, local models are released once their jobs are done,
+    and `after_model(model_id, keep=model_ids)` is called after each model (e.g. to clean up disk caches),
+    with the models of the jobs that are still pending or running, which must not be evicted.
+    With `skip_completed`, jobs that already have a row in `results_csv` are not run again.
+
+    With `workers` > 1 (default RUNNER_WORKERS), jobs fan out to a process pool where every worker
+    is pinned to its own slice of cores. Results still go through this process's single writer, in plan order.
+    With `share_weights` (default RUNNER_SHARE_WEIGHTS), local models and COMET are loaded here first and
+    the forked workers map the same weights (up to MODEL_CACHE_BUDGET_GB), so memory does not grow with the worker count.
+
+    With `shard=(i, N)` (default: the script's `--shard i/N` argument or RUNNER_SHARD) only the i-th of N
+    cost-balanced parts of the matrix runs, writing to per-shard CSVs that helpers.merge_shards combines.
+
+    With `pipeline` (default RUNNER_PIPELINE) and a single process, dataset loading, generation and scoring
+    run in their own threads with bounded queues in between, so the next sample is fetched and the previous
+    job is scored while the current one is generating. Stage utilization is printed at the end.
+
+    With INSTRUMENTATION=1, per-stage timings of every job are appended to a .timings.jsonl file next to `results_csv`.
+
+    Progress is journaled next to `results_csv`. If a previous run crashed, the CSVs are appended to
+    instead of overwritten, finished jobs are skipped and unfinished ones resume at the first missing sentence.
+    The journal is removed once every job has run.
+    """
+    jobs = plan_jobs(matrix)
+    shard = shard_from_argv() if shard is None else shard
+    canonical_results_csv = results_csv
+    if shard:
+        index, count = shard
+        shards, loads = assign_shards(jobs, count)
+        jobs = shards[index - 1]
+        results_csv, translations_csv = shard_path(results_csv, index, count), shard_path(translations_csv, index, count)
+        print(f"🧩 Shard {index}/{count}: {len(jobs)} job(s), {loads[index - 1] / max(sum(loads), 1):.0%} of the estimated cost")
+
+    journal = Journal(journal_path(results_csv))
+    if journal.resuming:
+        print(f"↩️ Resuming interrupted run from {journal.path}")
+        mode = "a"
+        _rollback(journal.pending_write)
+    if skip_completed:
+        completed = completed_jobs(canonical_results_csv, model_column) | completed_jobs(results_csv, model_column)
+        model_key = lambda job: job["model"] if model_column else None
+        for job in jobs:
+            if (model_key(job), job["dataset"], job["language"]) in completed:
+                print(f"⏩ Skipping already processed: {job['model']} | {job['dataset']} | {job['language']}")
+        jobs = [job for job in jobs if (model_key(job), job["dataset"], job["language"]) not in completed]
+
+    workers = RUNNER_WORKERS if workers is None else workers
+    share_weights = RUNNER_SHARE_WEIGHTS if share_weights is None else share_weights
+    pipeline = RUNNER_PIPELINE if pipeline is None else pipeline
+    if workers > 1:
+        results = _pool_results(jobs, journal, workers, share_weights)
+    elif pipeline:
+        results = _pipeline_results(jobs, journal)
+    else:
+        results = _serial_results(jobs, journal)
+
+    with ResultWriter(results_csv, translations_csv, model_column, mode, missing_value, error_value) as writer:
+        for i, (job, result) in enumerate(results):
+            if result is None:
+                print(f"⏩ Skipping already processed: {job['model']} | {job['dataset']} | {job['language']}")
+            else:
+                journal.begin_write(job, writer.offsets())
+                writer.write(result)
+                journal.finish_write(job)
+                write_records(timings_path(results_csv), result.get("timings") or take_job(job))
+
+            next_job = jobs[i + 1] if i + 1 < len(jobs) else None
+            if next_job is None or (next_job["backend"], next_job["model"]) != (job["backend"], job["model"]):
+                _finish_model(job, after_model, keep={later["model"] for later in jobs[i + 1:]})
+
+    journal.remove()
+
+
+def _serial_results(jobs, journal):
+    """Run jobs one after another in this process, yielding (job, result), or (job, None) for finished jobs."""
+    for job in jobs:
+        if journal.is_done(job):
+            yield job, None
+        else:
+            print(f"🔹 Testing {job['model']} on {job['dataset']} ({job['language']})")
+            yield job, run_job(job, journal)
+
+
+class _PipelineStage(threading.Thread):
+    """
+    Thread that applies one stage to every (job, result) from `inbox` and passes it on to `outbox`.
+    Skipped jobs (result None) are passed through untouched. Unexpected errors are forwarded so the writer re-raises them.
+    """
+
+    def __init__(self, name, fn, inbox, outbox):
+        super().__init__(name=f"pipeline-{name}", daemon=True)
+        self.stage_name = name
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.busy = 0.0  # Seconds spent working
+        self.blocked = 0.0  # Seconds waiting for room in the next queue (backpressure)
+
+    def run(self):
+        while True:
+            item = self.inbox.get()
+            if item is not None and not isinstance(item, BaseException):
+                job, result = item
+                if result is not None:
+                    start = time.perf_counter()
+                    try:
+                        item = (job, self.fn(result))
+                    except BaseException as e:
+                        item = e
+                    self.busy += time.perf_counter() - start
+            start = time.perf_counter()
+            self.outbox.put(item)
+            self.blocked += time.perf_counter() - start
+            if item is None or isinstance(item, BaseException):
+                return
+
+
+def _pipeline_results(jobs, journal):
+    """
+    Run jobs through load -> generate -> score threads connected by bounded queues, yielding
+    (job, result) in plan order like _serial_results. The caller's loop is the write stage.
+    """
+    todo = queue.Queue()
+    for job in jobs:
+        todo.put((job, None if journal.is_done(job) else {**job, "status": None}))
+    todo.put(None)  # End of jobs
+
+    loaded, generated, scored = (queue.Queue(maxsize=PIPELINE_QUEUE_SIZE) for _ in range(3))
+    stages = [
+        _PipelineStage("load", load_stage, todo, loaded),
+        _PipelineStage("generate", lambda result: generate_stage(result, journal), loaded, generated),
+        _PipelineStage("score", score_stage, generated, scored),
+    ]
+    for stage in stages:
+        stage.start()
+
+    print(f"🚰 Running {len(jobs)} job(s) through the load -> generate -> score -> write pipeline")
+    start = time.perf_counter()
+    writing = 0.0
+    while True:
+        item = scored.get()
+        if item is None:
+            break
+        if isinstance(item, BaseException):
+            raise item
+        job, result = item
+        if result is not None:
+            print(f"🔹 Writing {job['model']} on {job['dataset']} ({job['language']})")
+        resumed = time.perf_counter()
+        yield job, result
+        writing += time.perf_counter() - resumed
+
+    wall = max(time.perf_counter() - start, 1e-9)
+    report = " | ".join(f"{stage.stage_name} {stage.busy / wall:.0%} busy, {stage.blocked / wall:.0%} blocked" for stage in stages)
+    print(f"📊 Pipeline stage utilization over {wall:.1f}s: {report} | write {writing / wall:.0%} busy")
+
+
+def core_slices(workers):
+    """Split the cores this process may use into one contiguous slice per worker (workers share cores if there are too few)."""
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    if workers >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(workers)]
+    size, extra = divmod(len(cores), workers)
+    slices, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(cores[start:end])
+        start = end
+    return slices
+
+
+def _pool_context(share_weights):
+    """
+    fork only when weights are shared and this process runs no other thread yet (e.g. the API client loop),
+    since a thread holding a lock at fork time deadlocks the child. Otherwise forkserver (or spawn) starts
+    workers from a clean process.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if share_weights and "fork" in methods:
+        if threading.active_count() == 1:
+            return multiprocessing.get_context("fork")
+        print(f"⚠️ {threading.active_count() - 1} other thread(s) running, not forking: every worker loads its own models")
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _pool_results(jobs, journal, workers, share_weights=False):
+    """
+    Run jobs in a pool of worker processes, yielding (job, result) in plan order like _serial_results.
+    Workers journal their translations themselves, so an interrupted parallel run resumes like a serial one.
+    """
+    context = _pool_context(share_weights)
+    frozen = share_weights and _preload_shared([job for job in jobs if not journal.is_done(job)], context)
+    slices = context.Queue()
+    for cores in core_slices(workers):
+        slices.put(cores)
+
+    print(f"🧵 Running {len(jobs)} job(s) on {workers} worker processes")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(slices, journal.path)) as pool:
+            futures = [None if journal.is_done(job) else pool.submit(_run_worker_job, job) for job in jobs]
+            for job, future in zip(jobs, futures):
+                yield job, future.result() if future is not None else None
+    finally:
+        if frozen:
+            gc.unfreeze()  # Released models and everything else allocated before the pool can be collected again
+            gc.collect()
+
+
+def _preload_shared(jobs, context):
+    """
+    Load the jobs' local models and COMET before the workers fork. Forked workers find the models in their
+    inherited model cache and read the parent's pages copy-on-write, so only one copy exists.
+    Only models that fit MODEL_CACHE_BUDGET_GB together are preloaded (and pinned so the LRU keeps them);
+    the others are reported and every worker loads its own copy.
+    Returns True if the parent's objects were frozen out of garbage collection (undo with gc.unfreeze()).
+    """
+    import torch
+
+    if context.get_start_method() != "fork" or torch.cuda.is_available():
+        print("⚠️ Weight sharing needs fork and CPU models, every worker loads its own copy")
+        return False
+
+    budget = MODEL_CACHE_BUDGET_GB * 1024 ** 3
+    seen, not_shared = set(), []
+    for job in jobs:
+        load = BACKENDS[job["backend"]].get("load")
+        key = (job["backend"], job["model"], json.dumps(job["options"], sort_keys=True, default=str))
+        if load is None or key in seen:
+            continue
+        seen.add(key)
+        print(f"📦 Preloading {job['model']} for the workers")
+        load(job["model"], job["options"])
+        if cached_size() > budget:
+            release_model(job["model"])
+            not_shared.append(job["model"])
+        pin_cached_models()
+    shared = pin_cached_models()
+    if jobs:
+        get_comet_model().eval()
+
+    gc.freeze()  # Keep the garbage collector from writing to (and so copying) the parent's objects in every worker
+    print(f"📦 Sharing {shared / 1024 ** 3:.2f} GB of model weights (plus COMET) with the workers")
+    if not_shared:
+        print(f"⚠️ Not shared, over the {MODEL_CACHE_BUDGET_GB:g} GB model cache budget (each worker loads its own copy): "
+              f"{', '.join(not_shared)}")
+    return True
+
+
+_worker_journal = None
+
+
+def _init_worker(slices, path):
+    """Pin a new worker to its slice of cores and open the shared journal."""
+    global _worker_journal
+    import torch
+
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"  # The worker is pinned to its cores, keep tokenizers single-threaded
+    cores = slices.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    torch.set_num_threads(len(cores))
+    _worker_journal = Journal(path)
+    print(f"🧵 Worker {os.getpid()}: {len(cores)} thread(s) on core(s) {cores[0]}-{cores[-1]}")
+
+
+def _run_worker_job(job):
+    print(f"🔹 [{os.getpid()}] Testing {job['model']} on {job['dataset']} ({job['language']})")
+    result = run_job(job, _worker_journal)
+    return {**result, "timings": take_job(job)}  # Timings live in the worker, send them to the writer
+
+
+def _rollback(offsets):
+    """Truncate the CSVs to their size before a job whose rows may be half written."""
+    for path, size in (offsets or {}).items():
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            print(f"↩️ Removing partially written rows from {path}")
+            os.truncate(path, size)
+
+
+def _finish_model(job, after_model, keep=()):
+    """
+    Free a model's memory once all of its jobs have run (in pool mode workers keep their own model caches).
+    `keep` holds the models of the jobs still pending or running in workers and pipeline threads.
+    """
+    if BACKENDS[job["backend"]]["local"]:
+        release_model(job["model"])
+    if after_model is not None:
+        after_model(job["model"], keep=keep)
@@ -0,0 +1,97 @@
+import os
+import re
+import sys
+
+# Rough per-sentence cost of each backend, about proportional to the model's parameter count (millions)
+BACKEND_COST = {
+    "helsinki": 75,
+    "ctranslate2": 40,
+    "small100": 330,
+    "m2m": 420,
+    "nllb": 600,
+    "towerinstruct": 7000,
+    "gemini": 50,
+    "chatgpt": 50,
+    "google": 10,
+}
+DEFAULT_BACKEND_COST = 500
+
+# Sentences each loader samples per language
+DATASET_SENTENCES = {"Europarl": 20, "TED": 20, "WMT": 20, "montenegrin": 20, "OPUS": 1}
+
+# Loading a model costs about as much as translating this many sentences with it
+MODEL_LOAD_SENTENCES = 10
+
+
+def parse_shard(value):
+    """Parse "i/N" (1-based) into (i, N)."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not match:
+        raise ValueError(f"Invalid shard {value!r}, expected i/N, e.g. 1/4")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {value!r}, i must be between 1 and N")
+    return index, count
+
+
+def shard_from_argv(argv=None):
+    """The `--shard i/N` (or `--shard=i/N`) argument of the running script, falling back to RUNNER_SHARD."""
+    argv = sys.argv[1:] if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == "--shard" and i + 1 < len(argv):
+            return parse_shard(argv[i + 1])
+        if arg.startswith("--shard="):
+            return parse_shard(arg.split("=", 1)[1])
+    value = os.getenv("RUNNER_SHARD")
+    return parse_shard(value) if value else None
+
+
+def model_cost(job):
+    """Per-sentence cost of a job's model; TowerInstruct scales with its size (7B or 13B)."""
+    cost = BACKEND_COST.get(job["backend"], DEFAULT_BACKEND_COST)
+    if job["backend"] == "towerinstruct":
+        size = re.search(r"(\d+)B", job["model"])
+        cost = int(size.group(1)) * 1000 if size else cost
+    return cost
+
+
+def job_cost(job):
+    """Estimated cost of a job: model size times sentence count."""
+    return model_cost(job) * DATASET_SENTENCES.get(job["dataset"], 20)
+
+
+def assign_shards(jobs, count):
+    """
+    Split planned jobs into `count` shards of similar estimated cost.
+
+    Jobs are placed most expensive first on the shard that ends up cheapest, counting a model load
+    for every shard a model lands on, so jobs of the same model stay together when that is balanced.
+    The split only depends on the job list, so every node computes the same one.
+    Each shard keeps the jobs in plan order.
+    """
+    loads = [0] * count
+    models = [set() for _ in range(count)]
+    assignment = {}
+
+    order = sorted(range(len(jobs)), key=lambda i: -job_cost(jobs[i]))  # Stable: ties keep plan order
+    for i in order:
+        job = jobs[i]
+        model = (job["backend"], job["model"])
+        load_cost = model_cost(job) * MODEL_LOAD_SENTENCES
+
+        def total(shard):
+            return loads[shard] + job_cost(job) + (0 if model in models[shard] else load_cost)
+
+        shard = min(range(count), key=lambda s: (total(s), s))
+        loads[shard] = total(shard)
+        models[shard].add(model)
+        assignment[i] = shard
+
+    shards = [[job for i, job in enumerate(jobs) if assignment[i] == shard] for shard in range(count)]
+    return shards, loads
+
+
+def shard_path(path, index, count):
+    """Per-shard variant of an output CSV, e.g. data/scores/x.csv -> data/scores/x.shard1of4.csv"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.shard{index}of{count}{ext}"
@@ -0,0 +1,33 @@
+import os
+import sqlite3
+import threading
+
+_local = threading.local()
+
+
+def connect(path, schema):
+    """
+    Return this thread's connection to the SQLite cache at `path`, creating it with `schema` if needed.
+    WAL mode lets readers in other processes keep going while one process writes.
+    """
+    connections = _local.__dict__.setdefault("connections", {})
+    conn = connections.get(path)
+    if conn is None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = sqlite3.connect(path, timeout=60)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(schema)
+        connections[path] = conn
+    return conn
+
+
+def lookup(conn, table, column, keys):
+    """Return {key: column value} for the keys present in `table`."""
+    found = {}
+    for start in range(0, len(keys), 500):  # Stay below SQLite's bound-variable limit
+        chunk = keys[start:start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(f"SELECT key, {column} FROM {table} WHERE key IN ({placeholders})", chunk)
+        found.update(rows)
+    return found
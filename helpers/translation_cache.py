@@ -0,0 +1,83 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+
+from helpers.sqlite_cache import connect, lookup
+
+# On-disk cache of translations, shared by every runner. Set TRANSLATION_CACHE=0 to bypass it.
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "data/cache/translations.sqlite")
+TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE", "1") != "0"
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS translations ("
+    "key TEXT PRIMARY KEY, model_id TEXT, tgt_lang TEXT, translation TEXT)"
+)
+
+
+def cache_key(model_id, params, tgt_lang, source):
+    """Content address of one translation: model, decoding parameters, target language and source text."""
+    source_hash = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    payload = json.dumps([model_id, params, tgt_lang, source_hash], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_translate(model_id, params, tgt_lang, sources, translate_fn):
+    """
+    Return translations for `sources`, calling `translate_fn(missing_sources)` only for sentences
+    not already cached for this model, decoding parameters and target language.
+    Empty and "ERROR" translations are returned but never stored. `translate_fn` must return one translation
+    per input sentence, in order (LLM backends only return replies validated by helpers.prompt_packing ids).
+    If the count does not match, the alignment cannot be trusted: the output is padded with "ERROR"
+    (or truncated) as before and nothing from that call is cached.
+    """
+    if not TRANSLATION_CACHE_ENABLED:
+        return list(translate_fn(list(sources)))
+
+    conn = connect(TRANSLATION_CACHE_PATH, SCHEMA)
+    keys = [cache_key(model_id, params, tgt_lang, source) for source in sources]
+    found = lookup(conn, "translations", "translation", keys)
+    missing = [i for i, key in enumerate(keys) if key not in found]
+
+    with _stats_lock:
+        _stats["hits"] += len(sources) - len(missing)
+        _stats["misses"] += len(missing)
+
+    translations = [found.get(key) for key in keys]
+    if missing:
+        new_translations = list(translate_fn([sources[i] for i in missing]))
+        aligned = len(new_translations) == len(missing)
+        if not aligned:
+            print(f"⚠️ Expected {len(missing)} translations from {model_id}, got {len(new_translations)}; not caching them")
+            new_translations = (new_translations + ["ERROR"] * len(missing))[:len(missing)]
+
+        rows = []
+        for i, translation in zip(missing, new_translations):
+            translations[i] = translation
+            if aligned and translation and translation != "ERROR":
+                rows.append((keys[i], model_id, tgt_lang, translation))
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows)
+
+    return translations
+
+
+def translation_cache_stats():
+    """Return the number of cache hits and misses in this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def print_translation_cache_stats():
+    """Print translation cache hits and misses for this run."""
+    stats = translation_cache_stats()
+    total = stats["hits"] + stats["misses"]
+    if total:
+        print(f"🗃️ Translation cache: {stats['hits']} hit(s), {stats['misses']} miss(es) ({100 * stats['hits'] / total:.0f}% hit rate)")
+
+
+atexit.register(print_translation_cache_stats)
@@ -1,10 +1,36 @@
 import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from helpers.instrumentation import count_tokens, span
+from helpers.model_cache import get_model
+from helpers.quantization import resolve_quantization, quantize_int8, model_dtype
 
-def load_model():
-    """Load the M2M-100 model and tokenizer with GPU support."""
-    model_name = "facebook/m2m100_418M"  # Changed from NLLB-200
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
+MODEL_NAME = "facebook/m2m100_418M"
+
+# Dataset language codes to M2M-100 codes
+LANGUAGE_CODE_MAP = {
+    "bg": "bg", "cs": "cs", "da": "da", "nl": "nl", "et": "et", 
+    "fi": "fi", "fr": "fr", "de": "de", "el": "el", "hu": "hu", 
+    "it": "it", "lv": "lv", "lt": "lt", "pl": "pl", "pt": "pt", 
+    "ro": "ro", "sk": "sk", "sl": "sl", "es": "es", "sv": "sv", 
+    "tr": "tr", "hr": "hr", "is": "is", "mk": "mk", "sq": "sq", 
+    "no": "no"
+}
+
+# Decoding settings, also part of the translation cache key
+GENERATION_PARAMS = {
+    # "max_length": max_length,
+    # "max_new_tokens": max_new_tokens,
+    "num_beams": 5,  # Encourages more complete translations
+    "length_penalty": 1.2,  # Prevents overly short translations
+    "early_stopping": False,
+}
+
+def load_model(quantize=None):
+    """
+    Load the M2M-100 model and tokenizer with GPU support.
+    `quantize="int8"` loads dynamically quantized Linear layers on CPU (defaults to MODEL_QUANTIZATION).
+    """
+    model_name = MODEL_NAME  # Changed from NLLB-200
 
     # Check available device: Use CUDA if available, otherwise DirectML (AMD) or CPU
     if torch.cuda.is_available():
@@ -13,9 +39,18 @@ def load_model():
     else:
         device = torch.device("cpu")
         print("⚠️ Using CPU (No GPU detected)")
+    quantization = resolve_quantization(quantize, device)
+
+    def load():
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(device)
+        if quantization == "int8":
+            print("🗜️ Quantizing Linear layers to int8")
+            model = quantize_int8(model)
+        return model, tokenizer
 
-    # Load model and move it to the selected device
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(device)
+    # Load model onto the selected device, or reuse the cached copy for this precision
+    model, tokenizer = get_model(model_name, load, dtype=model_dtype(quantization), device=device)
     
     print("✅ M2M-100 Model loaded successfully!")
     return model, tokenizer, device
@@ -23,15 +58,16 @@ def load_model():
 def translate_text(model, tokenizer, text, src_lang, tgt_lang, device):
     """Translate text using M2M-100 model."""
     tokenizer.src_lang = src_lang
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True).to(device)
+    with span("tokenize") as s:
+        inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True).to(device)
+        if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer))
     forced_bos_token_id = tokenizer.convert_tokens_to_ids(f"<<{tgt_lang}>>")  # Changed for M2M-100
-    outputs = model.generate(
-        **inputs,
-        # max_length=max_length,
-        # max_new_tokens=max_new_tokens,
-        num_beams=5,  # Encourages more complete translations
-        length_penalty=1.2,  # Prevents overly short translations
-        early_stopping=False,
-        forced_bos_token_id=forced_bos_token_id
-    )
-    return tokenizer.batch_decode(outputs, skip_special_tokens=True)[0]
\ No newline at end of file
+    with span("generate") as s:
+        outputs = model.generate(
+            **inputs,
+            **GENERATION_PARAMS,
+            forced_bos_token_id=forced_bos_token_id
+        )
+        if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer), tokens_out=count_tokens(outputs, tokenizer))
+    with span("decode"):
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)[0]
\ No newline at end of file
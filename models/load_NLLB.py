@@ -1,10 +1,36 @@
 import torch
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from helpers.instrumentation import count_tokens, span
+from helpers.model_cache import get_model
+from helpers.quantization import resolve_quantization, quantize_int8, model_dtype
 
-def load_model():
-    """Load the NLLB-200 model and tokenizer with GPU support."""
-    model_name = "facebook/nllb-200-distilled-600M"
-    tokenizer = AutoTokenizer.from_pretrained(model_name)
+MODEL_NAME = "facebook/nllb-200-distilled-600M"
+
+# Dataset language codes to NLLB-200 codes
+LANGUAGE_CODE_MAP = {
+    "bg": "bul_Cyrl", "cs": "ces_Latn", "da": "dan_Latn", "nl": "nld_Latn", "et": "est_Latn", 
+    "fi": "fin_Latn", "fr": "fra_Latn", "de": "deu_Latn", "el": "ell_Latn", "hu": "hun_Latn", 
+    "it": "ita_Latn", "lv": "lav_Latn", "lt": "lit_Latn", "pl": "pol_Latn", "pt": "por_Latn", 
+    "ro": "ron_Latn", "sk": "slk_Latn", "sl": "slv_Latn", "es": "spa_Latn", "sv": "swe_Latn", 
+    "tr": "tur_Latn", "hr": "hrv_Latn", "is": "isl_Latn", "mk": "mkd_Cyrl", "sq": "sqi_Latn", 
+    "no": "nob_Latn"
+}
+
+# Decoding settings, also part of the translation cache key
+GENERATION_PARAMS = {
+    # "max_length": max_length,
+    # "max_new_tokens": max_new_tokens,
+    "num_beams": 5,  # Encourages more complete translations
+    "length_penalty": 1.2,  # Prevents overly short translations
+    "early_stopping": False,
+}
+
+def load_model(quantize=None):
+    """
+    Load the NLLB-200 model and tokenizer with GPU support.
+    `quantize="int8"` loads dynamically quantized Linear layers on CPU (defaults to MODEL_QUANTIZATION).
+    """
+    model_name = MODEL_NAME
 
     # Detect available device
     if torch.cuda.is_available():
@@ -13,9 +39,18 @@ def load_model():
     else:
         device = torch.device("cpu")  # Default to CPU
         print("⚠️ Using CPU (No GPU detected)")
+    quantization = resolve_quantization(quantize, device)
+
+    def load():
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(device)
+        if quantization == "int8":
+            print("🗜️ Quantizing Linear layers to int8")
+            model = quantize_int8(model)
+        return model, tokenizer
 
-    # Load model onto the selected device
-    model = AutoModelForSeq2SeqLM.from_pretrained(model_name).to(device)
+    # Load model onto the selected device, or reuse the cached copy for this precision
+    model, tokenizer = get_model(model_name, load, dtype=model_dtype(quantization), device=device)
     
     print("✅ NLLB-200 Model loaded successfully!")
     return model, tokenizer, device
@@ -23,15 +58,16 @@ def load_model():
 def translate_text(model, tokenizer, text, src_lang, tgt_lang, device):
     """Translate text using NLLB-200 model."""
     tokenizer.src_lang = src_lang
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True).to(device)
+    with span("tokenize") as s:
+        inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True).to(device)
+        if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer))
     forced_bos_token_id = tokenizer.convert_tokens_to_ids(tgt_lang)
-    outputs = model.generate(
-        **inputs,
-        # max_length=max_length,
-        # max_new_tokens=max_new_tokens,
-        num_beams=5,  # Encourages more complete translations
-        length_penalty=1.2,  # Prevents overly short translations
-        early_stopping=False,
-        forced_bos_token_id=forced_bos_token_id
-    )
-    return tokenizer.batch_decode(outputs, skip_special_tokens=True)[0]
\ No newline at end of file
+    with span("generate") as s:
+        outputs = model.generate(
+            **inputs,
+            **GENERATION_PARAMS,
+            forced_bos_token_id=forced_bos_token_id
+        )
+        if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer), tokens_out=count_tokens(outputs, tokenizer))
+    with span("decode"):
+        return tokenizer.batch_decode(outputs, skip_special_tokens=True)[0]
\ No newline at end of file
@@ -0,0 +1,43 @@
+import os
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+from helpers.async_clients import call
+from helpers.cassettes import replaying
+from helpers.prompt_packing import pack_max_tokens, translate_packed
+
+# Load OpenAI API key from environment (OPENAI_BASE_URL can point the client at a mock server)
+load_dotenv()
+
+MODEL_NAME = "gpt-4o-mini"
+
+# Request settings, also part of the translation cache key
+GENERATION_PARAMS = {"max_tokens": 3000, "temperature": 0.7}
+
+def load_chatgpt_async():
+    """Create an async OpenAI client; retries are left to helpers.async_clients."""
+    if replaying():
+        return None  # Responses come from cassettes, no API access needed
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        raise ValueError("Set the OPENAI_API_KEY in the .env file.")
+    return AsyncOpenAI(api_key=openai_api_key, max_retries=0)
+
+async def translate_batch_async(client, source_sentences, target_language):
+    """
+    Translate sentences with as few ChatGPT calls as possible: sentences are packed into
+    numbered JSON requests and every reply is checked against the ids it should contain.
+    """
+    async def send(prompt):
+        messages = [
+            {"role": "system", "content": f"You are a translator that translates English text to {target_language}."},
+            {"role": "user", "content": prompt}
+        ]
+        request = {"model": MODEL_NAME, "messages": messages, "response_format": {"type": "json_object"}, **GENERATION_PARAMS}
+
+        async def create():
+            response = await client.chat.completions.create(**request)
+            return response.choices[0].message.content
+
+        return await call("openai", create, cassette=request)
+
+    return await translate_packed(source_sentences, target_language, send, pack_max_tokens(GENERATION_PARAMS["max_tokens"]))
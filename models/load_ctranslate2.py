@@ -0,0 +1,97 @@
+import os
+import shutil
+import ctranslate2
+from transformers import AutoTokenizer
+from helpers.instrumentation import span
+from helpers.model_cache import get_model
+
+# Converted checkpoints are cached here, override with CTRANSLATE2_DIR in the environment or .env
+CTRANSLATE2_DIR = os.getenv("CTRANSLATE2_DIR", "data/cache/ctranslate2")
+
+# Weight type used at inference ("default" keeps the stored fp32 weights, "int8" is usually fastest on CPU)
+COMPUTE_TYPE = os.getenv("CTRANSLATE2_COMPUTE_TYPE", "default")
+
+# Decoding settings matching the transformers loaders, also part of the translation cache key
+TRANSLATE_PARAMS = {
+    "beam_size": 5,
+    "length_penalty": 1.2,
+    "max_decoding_length": 256,
+    "batch_type": "examples",  # "tokens" makes max_batch_size a token budget instead of a sentence count
+    "max_batch_size": 16,
+}
+
+def convert_model(model_name):
+    """Convert a Hugging Face Marian, NLLB or M2M-100 checkpoint to CTranslate2 once and return its directory."""
+    output_dir = os.path.join(CTRANSLATE2_DIR, model_name.replace("/", "--"))
+    if os.path.exists(os.path.join(output_dir, "model.bin")):
+        return output_dir
+
+    print(f"🔧 Converting {model_name} to CTranslate2...")
+    tmp_dir = output_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    ctranslate2.converters.TransformersConverter(model_name).convert(tmp_dir)
+    os.replace(tmp_dir, output_dir)  # Never leave a half-converted model behind
+    print(f"✅ Converted model saved to {output_dir}")
+    return output_dir
+
+def _directory_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def load_model(model_name, compute_type=None, inter_threads=1, intra_threads=0):
+    """
+    Load a CTranslate2 translator and the original tokenizer.
+    `inter_threads` runs batches in parallel, `intra_threads` is the thread count per batch (0 = all cores).
+    """
+    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    compute_type = compute_type or COMPUTE_TYPE
+    model_dir = convert_model(model_name)
+
+    def load():
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        translator = ctranslate2.Translator(model_dir, device=device, compute_type=compute_type,
+                                            inter_threads=inter_threads, intra_threads=intra_threads)
+        return translator, tokenizer
+
+    # Reuse the translator if it is already cached with the same settings
+    dtype = f"ctranslate2-{compute_type}-{inter_threads}x{intra_threads}"
+    translator, tokenizer = get_model(model_name, load, dtype=dtype, device=device,
+                                      size_fn=lambda _: _directory_size(model_dir))
+    return translator, tokenizer, device
+
+def _target_prefix(tokenizer, tgt_lang):
+    """Forced first target token: M2M-100 uses "__xx__" tokens, NLLB uses the language code itself."""
+    if hasattr(tokenizer, "get_lang_token"):
+        return [tokenizer.get_lang_token(tgt_lang)]
+    return [tgt_lang]
+
+def translate_batch(translator, tokenizer, sentences, src_lang=None, tgt_lang=None, **params):
+    """
+    Translate a list of sentences. `src_lang`/`tgt_lang` are only needed for multilingual models (NLLB, M2M-100).
+    `params` override TRANSLATE_PARAMS. Translations are returned in input order.
+    """
+    if not sentences:
+        return []
+    params = {**TRANSLATE_PARAMS, **params}
+
+    if src_lang:
+        tokenizer.src_lang = src_lang
+    with span("tokenize") as s:
+        sources = [tokenizer.convert_ids_to_tokens(tokenizer.encode(sentence)) for sentence in sentences]
+        if s: s.add(tokens_in=sum(map(len, sources)))
+    target_prefix = [_target_prefix(tokenizer, tgt_lang)] * len(sentences) if tgt_lang else None
+
+    with span("generate") as s:
+        results = translator.translate_batch(sources, target_prefix=target_prefix, **params)
+        if s: s.add(tokens_in=sum(map(len, sources)), tokens_out=sum(len(result.hypotheses[0]) - bool(tgt_lang) for result in results))
+    translations = []
+    with span("decode"):
+        for result in results:
+            tokens = result.hypotheses[0]
+            if tgt_lang:
+                tokens = tokens[1:]  # Drop the forced language token
+            translations.append(tokenizer.decode(tokenizer.convert_tokens_to_ids(tokens), skip_special_tokens=True))
+    return translations
+
+def translate_text(translator, tokenizer, text, src_lang=None, tgt_lang=None, **params):
+    """Translate one sentence with CTranslate2."""
+    return translate_batch(translator, tokenizer, [text], src_lang, tgt_lang, **params)[0]
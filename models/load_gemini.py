@@ -1,21 +1,35 @@
 import google.generativeai as genai
 from dotenv import load_dotenv
 import os
+from helpers.async_clients import call, in_thread
+from helpers.cassettes import replaying
+from helpers.prompt_packing import pack_max_tokens, translate_packed
 
 # Load environment variables
 load_dotenv()
 
+MODEL_NAME = "gemini-1.5-pro-002"  # Adjust model name if needed
+PROMPT_TEMPLATE = "Translate this sentence to {language}: {sentence}"
+MAX_OUTPUT_TOKENS = 8192  # Reply token limit of Gemini 1.5 Pro, sizes the packed requests
+
 def load_gemini():
     """
     Load the Gemini model using the API key.
     """
+    if replaying():
+        return None  # Responses come from cassettes, no API access needed
+
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("❌ Missing Gemini API key. Please set it in the .env file or environment variables.")
     
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-pro-002")  # Adjust model name if needed
+        endpoint = os.getenv("GEMINI_API_ENDPOINT")  # e.g. a local mock server
+        if endpoint:
+            genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+        else:
+            genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(MODEL_NAME)
         print("✅ Successfully loaded Gemini model!")
         return model
     except Exception as e:
@@ -44,3 +58,13 @@ def translate_text(model, text):
         print(f"❌ Translation error: {e}")
         return ""
 
+async def translate_batch_async(model, sentences, target_language):
+    """
+    Translate sentences with few Gemini requests: sentences are packed into numbered JSON
+    requests and only ids missing from (or malformed in) a reply are requested again.
+    """
+    async def send(prompt):
+        generate = in_thread(lambda: model.generate_content(prompt).text)
+        return await call("gemini", generate, cassette={"model": MODEL_NAME, "prompt": prompt})
+
+    return await translate_packed(sentences, target_language, send, pack_max_tokens(MAX_OUTPUT_TOKENS))
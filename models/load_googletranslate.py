@@ -0,0 +1,89 @@
+import asyncio
+import atexit
+import os
+import time
+from dotenv import load_dotenv
+from google.cloud import translate_v2 as translate
+from helpers.async_clients import call, in_thread
+from helpers.cassettes import replaying
+
+load_dotenv()
+
+MODEL_NAME = "google-translate-v2"
+
+# Per-request limits of the v2 API
+MAX_SEGMENTS_PER_REQUEST = 128
+MAX_CHARS_PER_REQUEST = 5000
+
+# language -> {"sentences", "requests", "seconds"} for this run
+REQUEST_STATS = {}
+
+def load_google():
+    """Create a Google Cloud Translation (v2) client from the environment's credentials."""
+    if replaying():
+        return None  # Responses come from cassettes, no API access needed
+    endpoint = os.getenv("GOOGLE_TRANSLATE_ENDPOINT")  # e.g. a local mock server
+    if endpoint:
+        return translate.Client(client_options={"api_endpoint": endpoint})
+    return translate.Client()
+
+def translate_text(client, text, target_language):
+    """Translate text using Google Cloud Translation API."""
+    return client.translate(text, target_language=target_language)["translatedText"]
+
+def pack_chunks(sentences, max_segments=MAX_SEGMENTS_PER_REQUEST, max_chars=MAX_CHARS_PER_REQUEST):
+    """Split sentence indices into consecutive chunks that fit one request (a longer sentence goes alone)."""
+    chunks = []
+    current = []
+    current_chars = 0
+    for i, sentence in enumerate(sentences):
+        if current and (len(current) >= max_segments or current_chars + len(sentence) > max_chars):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(i)
+        current_chars += len(sentence)
+    if current:
+        chunks.append(current)
+    return chunks
+
+async def translate_batch_async(client, sentences, target_language):
+    """
+    Translate sentences using the API's list input: sentences are packed into requests under the
+    segment and character limits, requests run concurrently, and results come back in input order.
+    Sentences of a request that still fails after retries are returned as "ERROR".
+    """
+    chunks = pack_chunks(sentences)
+
+    async def translate_chunk(chunk):
+        texts = [sentences[i] for i in chunk]
+        request = in_thread(lambda: [result["translatedText"] for result in client.translate(texts, target_language=target_language)])
+        return await call("google", request, cassette={"q": texts, "target": target_language})
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(translate_chunk(chunk) for chunk in chunks), return_exceptions=True)
+    seconds = time.perf_counter() - start
+
+    translations = ["ERROR"] * len(sentences)
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, Exception):
+            print(f"⚠️ Translation error for {target_language}: {result}")
+            continue
+        for i, translation in zip(chunk, result):
+            translations[i] = translation
+
+    stats = REQUEST_STATS.setdefault(target_language, {"sentences": 0, "requests": 0, "seconds": 0.0})
+    stats["sentences"] += len(sentences)
+    stats["requests"] += len(chunks)
+    stats["seconds"] += seconds
+    print(f"🌐 Google Translate ({target_language}): {len(sentences)} sentence(s) in {len(chunks)} request(s), "
+          f"{len(sentences) / max(seconds, 1e-9):.1f} sentences/s")
+    return translations
+
+def print_request_stats():
+    """Print sentences, requests and throughput per target language for this run."""
+    for language, stats in REQUEST_STATS.items():
+        print(f"🌐 Google Translate {language}: {stats['sentences']} sentence(s), {stats['requests']} request(s), "
+              f"{stats['sentences'] / max(stats['seconds'], 1e-9):.1f} sentences/s")
+
+atexit.register(print_request_stats)
@@ -1,25 +1,78 @@
 import torch
 from transformers import MarianMTModel, MarianTokenizer
+from helpers.batching import length_buckets
+from helpers.instrumentation import count_tokens, span
+from helpers.model_cache import get_model
+from helpers.quantization import resolve_quantization, quantize_int8, model_dtype
 
-def load_model(model_name):
-    """Load a translation model and tokenizer from Hugging Face and move model to GPU if available."""
+# Decoding settings, also part of the translation cache key
+GENERATION_PARAMS = {
+    # "max_length": max_length,
+    # "max_new_tokens": max_new_tokens,
+    "num_beams": 5,  # Encourages more complete translations
+    "length_penalty": 1.2,  # Prevents overly short translations
+    "early_stopping": False,
+}
+
+def load_model(model_name, quantize=None):
+    """
+    Load a translation model and tokenizer from Hugging Face and move model to GPU if available.
+    `quantize="int8"` loads dynamically quantized Linear layers on CPU (defaults to MODEL_QUANTIZATION).
+    """
     device = "cuda" if torch.cuda.is_available() else "cpu"
-    
-    tokenizer = MarianTokenizer.from_pretrained(model_name)
-    model = MarianMTModel.from_pretrained(model_name).to(device)  # Move model to GPU
+    quantization = resolve_quantization(quantize, device)
+
+    def load():
+        tokenizer = MarianTokenizer.from_pretrained(model_name)
+        model = MarianMTModel.from_pretrained(model_name).to(device)  # Move model to GPU
+        if quantization == "int8":
+            model = quantize_int8(model)
+        return model, tokenizer
 
+    # Reuse the model if it is already cached for this device and precision
+    model, tokenizer = get_model(model_name, load, dtype=model_dtype(quantization), device=device)
     return model, tokenizer, device  # Return device for later use
 
 
 def translate_text(model, tokenizer, text, device):
    """Translate text using the specified model."""
-   inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True).to(device)
-   translated = model.generate(
-      **inputs,
-      # max_length=max_length,
-      # max_new_tokens=max_new_tokens,
-      num_beams=5,  # Encourages more complete translations
-      length_penalty=1.2,  # Prevents overly short translations
-      early_stopping=False
-   )
-   return tokenizer.decode(translated[0], skip_special_tokens=True)
\ No newline at end of file
+   with span("tokenize") as s:
+      inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True).to(device)
+      if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer))
+   with span("generate") as s:
+      translated = model.generate(
+         **inputs,
+         **GENERATION_PARAMS
+      )
+      if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer), tokens_out=count_tokens(translated, tokenizer))
+   with span("decode"):
+      return tokenizer.decode(translated[0], skip_special_tokens=True)
+
+
+def translate_batch(model, tokenizer, sentences, device, batch_size=16, max_tokens=4096):
+    """
+    Translate a list of sentences, batching inputs of similar token length together.
+    `max_tokens` bounds the padded source tokens per batch. Translations are returned in input order.
+    """
+    if not sentences:
+        return []
+
+    with span("tokenize"):
+        lengths = [len(ids) for ids in tokenizer(sentences, truncation=True)["input_ids"]]
+    translations = [""] * len(sentences)
+
+    for batch in length_buckets(lengths, batch_size, max_tokens):
+        with span("tokenize") as s:
+            inputs = tokenizer([sentences[i] for i in batch], return_tensors="pt", padding=True, truncation=True).to(device)
+            if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer))
+        with span("generate") as s, torch.no_grad():
+            translated = model.generate(
+                **inputs,
+                **GENERATION_PARAMS
+            )
+            if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer), tokens_out=count_tokens(translated, tokenizer))
+        with span("decode"):
+            for i, text in zip(batch, tokenizer.batch_decode(translated, skip_special_tokens=True)):
+                translations[i] = text
+
+    return translations
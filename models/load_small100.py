@@ -2,12 +2,36 @@
 import torch
 from transformers import M2M100ForConditionalGeneration
 from helpers.tokenization_small100 import SMALL100Tokenizer
+from helpers.instrumentation import count_tokens, span
+from helpers.model_cache import get_model
+
+MODEL_NAME = "alirezamsh/small100"
+
+# Decoding settings, also part of the translation cache key
+GENERATION_PARAMS = {"num_beams": 10, "max_length": 256, "early_stopping": True}
 
 def load_small100(target_lang_code):
-    model_name = "alirezamsh/small100"
+    model_name = MODEL_NAME
     device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    
-    model = M2M100ForConditionalGeneration.from_pretrained(model_name).to(device)
-    tokenizer = SMALL100Tokenizer.from_pretrained(model_name, tgt_lang=target_lang_code)
-    
+
+    def load():
+        model = M2M100ForConditionalGeneration.from_pretrained(model_name).to(device)
+        tokenizer = SMALL100Tokenizer.from_pretrained(model_name, tgt_lang=target_lang_code)
+        return model, tokenizer
+
+    # The model is shared across languages, only the tokenizer's target language changes
+    model, tokenizer = get_model(model_name, load, device=device)
+    tokenizer.tgt_lang = target_lang_code
+
     return model, tokenizer, device
+
+def translate_text(model, tokenizer, text, device):
+    """Translate text with SMALL100 into the tokenizer's target language."""
+    with span("tokenize") as s:
+        inputs = tokenizer(text, return_tensors="pt").to(device)
+        if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer))
+    with span("generate") as s:
+        output = model.generate(**inputs, **GENERATION_PARAMS)
+        if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer), tokens_out=count_tokens(output, tokenizer))
+    with span("decode"):
+        return tokenizer.batch_decode(output, skip_special_tokens=True)[0]
@@ -1,17 +1,47 @@
 import torch
 from transformers import AutoModelForCausalLM, AutoTokenizer
+from helpers.batching import length_buckets
+from helpers.instrumentation import count_tokens, span
+from helpers.model_cache import get_model
+
+TOWERINSTRUCT_MODELS = {
+    7: "Unbabel/TowerInstruct-7B-v0.2",
+    13: "Unbabel/TowerInstruct-13B-v0.1",
+}
+
+# Decoding settings, also part of the translation cache key
+GENERATION_PARAMS = {
+    "num_beams": 5,  # Encourages more complete translations
+    "length_penalty": 1.2,  # Prevents overly short translations
+    "early_stopping": False,
+}
+
+# Instruction in TowerInstruct's own prompt format, wrapped in the model's chat template
+PROMPT_FORMAT = "tower-chat-v1"  # Bump when the prompt changes, it is part of the translation cache key
+PROMPT_TEMPLATE = "Translate the following text from English into {language}.\nEnglish: {text}\n{language}:"
+
+# Generated tokens are bounded by the longest source in the batch: ratio * source tokens + slack, at most MAX_NEW_TOKENS
+MAX_NEW_TOKENS = 512
+NEW_TOKENS_RATIO = 2.0
+NEW_TOKENS_SLACK = 16
+
+# Dataset language codes to the names used in the prompt
+LANGUAGE_NAMES = {
+    "bg": "Bulgarian", "cs": "Czech", "da": "Danish", "nl": "Dutch", "et": "Estonian",
+    "fi": "Finnish", "fr": "French", "de": "German", "el": "Greek", "hu": "Hungarian",
+    "it": "Italian", "lv": "Latvian", "lt": "Lithuanian", "pl": "Polish", "pt": "Portuguese",
+    "ro": "Romanian", "sk": "Slovak", "sl": "Slovenian", "es": "Spanish", "sv": "Swedish",
+    "tr": "Turkish", "hr": "Croatian", "is": "Icelandic", "mk": "Macedonian", "sq": "Albanian",
+    "no": "Norwegian", "nb": "Norwegian Bokmål", "me": "Montenegrin", "sr": "Serbian",
+}
 
 def load_towerinstruct(parameters):
     """
     Load the TowerInstruct model based on user input (7 for 7B, 13 for 13B) with GPU support.
     """
-    model_name = None
+    model_name = TOWERINSTRUCT_MODELS.get(parameters)
 
-    if parameters == 7:
-        model_name = "Unbabel/TowerInstruct-7B-v0.2"
-    elif parameters == 13:
-        model_name = "Unbabel/TowerInstruct-13B-v0.1"
-    else:
+    if model_name is None:
         print("❌ Incorrect parameter passed! Use 7 or 13.")
         return None, None, None
 
@@ -26,32 +56,78 @@ def load_towerinstruct(parameters):
         print("⚠️ Using CPU (No GPU detected)")
 
     try:
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForCausalLM.from_pretrained(model_name).to(device)  # Load model on GPU
+        def load():
+            # Left padding keeps every prompt right before its generated tokens in a batch
+            tokenizer = AutoTokenizer.from_pretrained(model_name, padding_side="left")
+            if tokenizer.pad_token is None:
+                tokenizer.pad_token = tokenizer.eos_token
+            model = AutoModelForCausalLM.from_pretrained(model_name).to(device)  # Load model on GPU
+            return model, tokenizer
+
+        model, tokenizer = get_model(model_name, load, device=device)
         print(f"✅ Successfully loaded {model_name}!")
         return model, tokenizer, device
     except Exception as e:
         print(f"❌ Error loading {model_name}: {e}")
         return None, None, None
 
-def translate_text(model, tokenizer, text, device):
+def build_prompt(tokenizer, text, target_language):
     """
-    Translate text using the specified TowerInstruct model.
+    Chat-formatted translation instruction for one sentence, ending where the assistant's answer starts.
+    Without a target language the text is used as the prompt as it is (what translate_text always did).
+    """
+    if target_language is None:
+        return text
+    language = LANGUAGE_NAMES.get(target_language, target_language)
+    messages = [{"role": "user", "content": PROMPT_TEMPLATE.format(language=language, text=text)}]
+    return tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+
+def translate_batch(model, tokenizer, sentences, target_language, device, batch_size=8, max_tokens=4096):
+    """
+    Translate English sentences into `target_language` (a dataset language code), batching sentences of similar
+    length with left-padded chat prompts. `max_tokens` bounds the padded prompt tokens per batch.
+    Only the generated tokens are decoded. Translations are returned in input order.
     """
     if model is None or tokenizer is None:
         print("❌ Model or tokenizer is not loaded.")
-        return ""
-    
-    inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True).to(device)
-    translated = model.generate(
-        **inputs,
-        # max_length=max_length,
-        # max_new_tokens=max_new_tokens,
-        num_beams=5,  # Encourages more complete translations
-        length_penalty=1.2,  # Prevents overly short translations
-        early_stopping=False
-    )
-    return tokenizer.decode(translated[0], skip_special_tokens=True)
+        return [""] * len(sentences)
+    if not sentences:
+        return []
+
+    with span("tokenize"):
+        prompts = [build_prompt(tokenizer, sentence, target_language) for sentence in sentences]
+        source_lengths = [len(ids) for ids in tokenizer(sentences, add_special_tokens=False)["input_ids"]]
+        # Add BOS unless the chat template already starts with it
+        add_special_tokens = not (tokenizer.bos_token and prompts[0].startswith(tokenizer.bos_token))
+        prompt_lengths = [len(ids) for ids in tokenizer(prompts, add_special_tokens=add_special_tokens)["input_ids"]]
+    translations = [""] * len(sentences)
 
+    for batch in length_buckets(prompt_lengths, batch_size, max_tokens):
+        with span("tokenize") as s:
+            inputs = tokenizer([prompts[i] for i in batch], return_tensors="pt", padding=True,
+                               add_special_tokens=add_special_tokens).to(device)
+            if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer))
+        longest_source = max(source_lengths[i] for i in batch)
+        max_new_tokens = min(MAX_NEW_TOKENS, int(longest_source * NEW_TOKENS_RATIO) + NEW_TOKENS_SLACK)
 
+        with span("generate") as s, torch.no_grad():
+            outputs = model.generate(
+                **inputs,
+                **GENERATION_PARAMS,
+                max_new_tokens=max_new_tokens,
+                pad_token_id=tokenizer.pad_token_id,
+            )
+            generated = outputs[:, inputs["input_ids"].shape[1]:]  # Strip the prompt tokens
+            if s: s.add(tokens_in=count_tokens(inputs["input_ids"], tokenizer), tokens_out=count_tokens(generated, tokenizer))
+        with span("decode"):
+            for i, text in zip(batch, tokenizer.batch_decode(generated, skip_special_tokens=True)):
+                translations[i] = text.strip()
 
+    return translations
+
+def translate_text(model, tokenizer, text, device, target_language=None):
+    """
+    Translate text using the specified TowerInstruct model.
+    With `target_language` (a dataset language code) the text is wrapped in the translation instruction.
+    """
+    return translate_batch(model, tokenizer, [text], target_language, device)[0]
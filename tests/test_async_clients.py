@@ -0,0 +1,122 @@
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from helpers import async_clients
+from helpers.async_clients import call, in_thread
+
+
+class MockAPI(BaseHTTPRequestHandler):
+    """Local stand-in for a provider: replies with the next scripted status for the requested path."""
+
+    scripts = {}  # path -> list of (status, headers), the last one repeats
+    hits = {}
+    in_flight = 0
+    max_in_flight = 0
+    delay = 0.0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            hit = cls.hits.get(self.path, 0)
+            cls.hits[self.path] = hit + 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(cls.delay)
+        script = cls.scripts.get(self.path, [(200, {})])
+        status, headers = script[min(hit, len(script) - 1)]
+        with cls.lock:
+            cls.in_flight -= 1
+
+        body = b'{"ok": true}'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    MockAPI.scripts, MockAPI.hits = {}, {}
+    MockAPI.in_flight = MockAPI.max_in_flight = 0
+    MockAPI.delay = 0.0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), MockAPI)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def mock_provider(monkeypatch):
+    monkeypatch.setitem(async_clients.PROVIDER_LIMITS, "mock", {"concurrency": 8, "requests_per_second": 1000.0, "burst": 1000})
+    monkeypatch.setattr(async_clients, "_limiters", {})
+    monkeypatch.setattr(async_clients, "_latencies", {})
+    monkeypatch.setattr(async_clients, "_requests", {})
+    monkeypatch.setattr(async_clients, "RETRY_BASE_DELAY", 0.01)
+
+
+def fetch(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read().decode("utf-8")
+
+
+def request(url):
+    return call("mock", in_thread(fetch, url))
+
+
+def test_503_is_retried_after_retry_after(server):
+    MockAPI.scripts["/busy"] = [(503, {"Retry-After": "0.2"}), (503, {"Retry-After": "0.2"}), (200, {})]
+    start = time.perf_counter()
+    assert async_clients.run(request(server + "/busy")) == '{"ok": true}'
+    assert time.perf_counter() - start >= 0.4
+    assert MockAPI.hits["/busy"] == 3
+
+
+def test_400_is_not_retried(server):
+    MockAPI.scripts["/bad"] = [(400, {})]
+    with pytest.raises(urllib.error.HTTPError):
+        async_clients.run(request(server + "/bad"))
+    assert MockAPI.hits["/bad"] == 1
+
+
+def test_retries_give_up_after_max_retries(server, monkeypatch):
+    monkeypatch.setattr(async_clients, "MAX_RETRIES", 2)
+    MockAPI.scripts["/down"] = [(500, {})]
+    with pytest.raises(urllib.error.HTTPError):
+        async_clients.run(request(server + "/down"))
+    assert MockAPI.hits["/down"] == 3
+
+
+def test_concurrency_limit_holds(server, monkeypatch):
+    monkeypatch.setitem(async_clients.PROVIDER_LIMITS, "mock", {"concurrency": 2, "requests_per_second": 1000.0, "burst": 1000})
+    MockAPI.delay = 0.05
+    async_clients.run_all(request(server + f"/{i}") for i in range(8))
+    assert MockAPI.max_in_flight == 2
+
+
+def test_token_bucket_limits_the_rate(server, monkeypatch):
+    monkeypatch.setitem(async_clients.PROVIDER_LIMITS, "mock", {"concurrency": 8, "requests_per_second": 20.0, "burst": 2})
+    start = time.perf_counter()
+    async_clients.run_all(request(server + f"/{i}") for i in range(6))
+    assert time.perf_counter() - start >= (6 - 2) / 20 * 0.9  # Two burst tokens, then 20 per second
+
+
+def test_stats_count_requests_not_attempts(server):
+    MockAPI.scripts["/flaky"] = [(503, {"Retry-After": "0"}), (200, {})]
+    MockAPI.scripts["/bad"] = [(400, {})]
+    results = async_clients.run_all([request(server + "/flaky"), request(server + "/ok"), request(server + "/bad")])
+    assert isinstance(results[2], urllib.error.HTTPError)
+
+    stats = async_clients.latency_stats()["mock"]
+    assert (stats["requests"], stats["failed"], stats["retries"]) == (3, 1, 1)
@@ -0,0 +1,52 @@
+from helpers.batching import budget_batch_size, length_buckets
+
+
+def test_every_index_appears_once():
+    lengths = [5, 1, 9, 3, 3, 7, 2]
+    batches = length_buckets(lengths, batch_size=3)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+
+
+def test_longest_items_come_first():
+    lengths = [5, 1, 9, 3, 7, 2]
+    batches = length_buckets(lengths, batch_size=2)
+    assert [[lengths[i] for i in batch] for batch in batches] == [[9, 7], [5, 3], [2, 1]]
+
+
+def test_batch_size_is_respected():
+    assert [len(batch) for batch in length_buckets([4] * 10, batch_size=4)] == [4, 4, 2]
+
+
+def test_padded_token_budget_is_respected():
+    lengths = [10, 10, 10, 4, 4, 4, 4]
+    batches = length_buckets(lengths, batch_size=16, max_tokens=20)
+    assert all(max(lengths[i] for i in batch) * len(batch) <= 20 for batch in batches)
+    assert [len(batch) for batch in batches] == [2, 2, 3]
+
+
+def test_item_over_the_budget_gets_its_own_batch():
+    assert length_buckets([50, 3, 3], batch_size=16, max_tokens=20) == [[0], [1, 2]]
+
+
+def test_empty_items_count_as_one_token():
+    assert length_buckets([0, 0, 0], batch_size=16, max_tokens=2) == [[0, 1], [2]]
+
+
+def test_no_items_no_batches():
+    assert length_buckets([]) == []
+
+
+def test_budget_batch_size_fits_the_longest_item():
+    assert budget_batch_size([30, 500, 120], batch_size=64, max_tokens=8192) == 16
+
+
+def test_budget_batch_size_is_capped_by_batch_size():
+    assert budget_batch_size([10, 20], batch_size=64, max_tokens=8192) == 64
+
+
+def test_budget_batch_size_is_at_least_one():
+    assert budget_batch_size([20000], batch_size=64, max_tokens=8192) == 1
+
+
+def test_budget_batch_size_without_a_budget():
+    assert budget_batch_size([20000], batch_size=8) == 8
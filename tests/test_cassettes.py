@@ -0,0 +1,78 @@
+import asyncio
+import os
+
+import pytest
+
+from helpers import async_clients, cassettes
+from helpers.cassettes import request_key, with_cassette
+
+# Recorded responses for the three sentences below (see tests/cassettes)
+RECORDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes")
+SENTENCES = ["The cat sleeps.", "It is raining today.", "Thank you very much!"]
+GERMAN = ["Die Katze schläft.", "Heute regnet es.", "Vielen Dank!"]
+
+
+def cassette_mode(monkeypatch, mode, directory):
+    monkeypatch.setattr(cassettes, "CASSETTE_MODE", mode)
+    monkeypatch.setattr(cassettes, "CASSETTE_DIR", str(directory))
+    monkeypatch.setattr(cassettes, "CASSETTE_LATENCY", "")
+
+
+def test_recorded_response_is_replayed(tmp_path, monkeypatch):
+    async def perform():
+        return {"text": "Hallo"}
+
+    async def unreachable():
+        raise AssertionError("replay must not call the API")
+
+    cassette_mode(monkeypatch, "record", tmp_path)
+    asyncio.run(with_cassette("openai", {"prompt": "Hello"}, perform))
+    cassette_mode(monkeypatch, "replay", tmp_path)
+    assert asyncio.run(with_cassette("openai", {"prompt": "Hello"}, unreachable)) == {"text": "Hallo"}
+
+
+def test_missing_cassette_fails_in_replay(tmp_path, monkeypatch):
+    async def perform():
+        return "never"
+
+    cassette_mode(monkeypatch, "replay", tmp_path)
+    with pytest.raises(LookupError):
+        asyncio.run(with_cassette("openai", {"prompt": "Hello"}, perform))
+
+
+def test_key_ignores_dict_order_and_tuples():
+    assert request_key("google", {"q": ("a", "b"), "target": "de"}) == request_key("google", {"target": "de", "q": ["a", "b"]})
+
+
+def test_key_keeps_surrounding_whitespace():
+    assert request_key("gemini", {"prompt": "Hello"}) != request_key("gemini", {"prompt": " Hello\n"})
+
+
+def test_key_depends_on_provider():
+    assert request_key("openai", {"prompt": "Hello"}) != request_key("gemini", {"prompt": "Hello"})
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    cassette_mode(monkeypatch, "replay", RECORDED_DIR)
+
+
+def test_chatgpt_replays_offline(replay):
+    pytest.importorskip("dotenv")
+    pytest.importorskip("openai")
+    from models.load_chatgpt import load_chatgpt_async, translate_batch_async
+    assert async_clients.run(translate_batch_async(load_chatgpt_async(), SENTENCES, "German")) == GERMAN
+
+
+def test_gemini_replays_offline(replay):
+    pytest.importorskip("dotenv")
+    pytest.importorskip("google.generativeai")
+    from models.load_gemini import load_gemini, translate_batch_async
+    assert async_clients.run(translate_batch_async(load_gemini(), SENTENCES, "German")) == GERMAN
+
+
+def test_google_translate_replays_offline(replay):
+    pytest.importorskip("dotenv")
+    pytest.importorskip("google.cloud.translate_v2")
+    from models.load_googletranslate import load_google, translate_batch_async
+    assert async_clients.run(translate_batch_async(load_google(), SENTENCES, "de")) == GERMAN
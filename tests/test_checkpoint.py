@@ -0,0 +1,62 @@
+from helpers.checkpoint import Journal, journal_path
+
+JOB = {"model": "model", "dataset": "WMT", "language": "de"}
+SOURCES = ["One.", "Two.", "Three."]
+
+
+def test_journaled_translations_survive_a_restart(tmp_path):
+    path = journal_path(str(tmp_path / "results.csv"))
+    Journal(path).record_translations(JOB, [0, 2], SOURCES, ["Eins.", "Drei."])
+
+    journal = Journal(path)
+    assert journal.resuming
+    assert journal.completed_translations(JOB, SOURCES) == {0: "Eins.", 2: "Drei."}
+
+
+def test_changed_sources_are_not_reused(tmp_path):
+    path = str(tmp_path / "run.journal")
+    Journal(path).record_translations(JOB, [0, 1], SOURCES, ["Eins.", "Zwei."])
+    assert Journal(path).completed_translations(JOB, ["One.", "Another two."]) == {0: "Eins."}
+
+
+def test_failed_translations_are_not_journaled(tmp_path):
+    path = str(tmp_path / "run.journal")
+    Journal(path).record_translations(JOB, [0, 1, 2], SOURCES, ["Eins.", "ERROR", ""])
+    assert Journal(path).completed_translations(JOB, SOURCES) == {0: "Eins."}
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "run.journal")
+    Journal(path).record_translations(JOB, [0], SOURCES, ["Eins."])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "translation", "key": ')
+    assert Journal(path).completed_translations(JOB, SOURCES) == {0: "Eins."}
+
+
+def test_unfinished_write_keeps_its_offsets(tmp_path):
+    path = str(tmp_path / "run.journal")
+    Journal(path).begin_write(JOB, {"results.csv": 120})
+
+    journal = Journal(path)
+    assert journal.pending_write == {"results.csv": 120}
+    assert not journal.is_done(JOB)
+
+
+def test_finished_write_marks_the_job_done(tmp_path):
+    path = str(tmp_path / "run.journal")
+    journal = Journal(path)
+    journal.record_translations(JOB, [0], SOURCES, ["Eins."])
+    journal.begin_write(JOB, {"results.csv": 120})
+    journal.finish_write(JOB)
+
+    reloaded = Journal(path)
+    assert reloaded.pending_write is None
+    assert reloaded.is_done(JOB)
+
+
+def test_remove_deletes_the_journal(tmp_path):
+    path = tmp_path / "run.journal"
+    journal = Journal(str(path))
+    journal.finish_write(JOB)
+    journal.remove()
+    assert not path.exists()
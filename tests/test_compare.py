@@ -0,0 +1,71 @@
+import json
+
+from benchmarks.compare import bootstrap_paired, bootstrap_ratio, compare
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return str(path)
+
+
+def trials(stage, seconds, batch_size=None):
+    return {"backend": "helsinki", "model": "tiny-marian", "stage": stage, "batch_size": batch_size, "trial_seconds": seconds}
+
+
+def timing(dataset, language, seconds, calls=1):
+    return {"backend": "helsinki", "model": "opus-mt", "stage": "generate", "options": {},
+            "dataset": dataset, "language": language, "calls": calls, "wall_seconds": seconds * calls}
+
+
+def verdicts(rows):
+    return {(row["stage"], row["config"]): row["verdict"] for row in rows}
+
+
+def test_clear_slowdown_is_slower(tmp_path):
+    before = write_jsonl(tmp_path / "a.jsonl", [trials("translate_text", [1.0, 1.01, 0.99, 1.0, 1.02])])
+    after = write_jsonl(tmp_path / "b.jsonl", [trials("translate_text", [1.5, 1.52, 1.49, 1.5, 1.51])])
+    assert verdicts(compare(before, after)) == {("translate_text", ""): "slower"}
+
+
+def test_noise_within_threshold_is_same(tmp_path):
+    before = write_jsonl(tmp_path / "a.jsonl", [trials("translate_text", [1.0, 1.02, 0.98, 1.01, 0.99])])
+    after = write_jsonl(tmp_path / "b.jsonl", [trials("translate_text", [1.01, 0.99, 1.0, 1.02, 0.98])])
+    assert verdicts(compare(before, after)) == {("translate_text", ""): "same"}
+
+
+def test_batch_sizes_are_compared_separately(tmp_path):
+    before = write_jsonl(tmp_path / "a.jsonl", [trials("translate_batch", [1.0] * 3, 8), trials("translate_batch", [1.0] * 3, 16)])
+    after = write_jsonl(tmp_path / "b.jsonl", [trials("translate_batch", [1.0] * 3, 8), trials("translate_batch", [0.5] * 3, 16)])
+    assert verdicts(compare(before, after)) == {("translate_batch", "batch=8"): "same", ("translate_batch", "batch=16"): "faster"}
+
+
+def test_too_few_trials_give_no_verdict(tmp_path):
+    before = write_jsonl(tmp_path / "a.jsonl", [trials("translate_text", [1.0, 1.0])])
+    after = write_jsonl(tmp_path / "b.jsonl", [trials("translate_text", [2.0, 2.0])])
+    assert verdicts(compare(before, after)) == {("translate_text", ""): "few"}
+
+
+def test_baseline_path_missing_from_the_new_run(tmp_path):
+    before = write_jsonl(tmp_path / "a.jsonl", [trials("translate_text", [1.0] * 3), trials("translate_batch", [1.0] * 3, 8)])
+    after = write_jsonl(tmp_path / "b.jsonl", [trials("translate_text", [1.0] * 3)])
+    assert verdicts(compare(before, after))[("translate_batch", "batch=8")] == "missing"
+
+
+def test_timings_jobs_are_paired_so_the_dataset_mix_is_not_noise(tmp_path):
+    jobs = [("WMT", "de", 0.1), ("WMT", "fr", 2.0), ("TED", "de", 0.5), ("TED", "fr", 5.0)]
+    before = write_jsonl(tmp_path / "a.jsonl", [timing(d, l, s) for d, l, s in jobs])
+    after = write_jsonl(tmp_path / "b.jsonl", [timing(d, l, s * 1.3) for d, l, s in jobs])
+    [row] = compare(before, after)
+    assert row["verdict"] == "slower"
+    assert row["trials"] == (4, 4)
+    assert abs(row["ratio"] - 1.3) < 1e-9
+
+
+def test_only_jobs_in_both_timings_runs_are_paired():
+    ratio, low, high, paired = bootstrap_paired({("WMT", "de"): [1.0], ("WMT", "fr"): [1.0]},
+                                                {("WMT", "de"): [2.0], ("TED", "de"): [9.0]})
+    assert (ratio, low, high, paired) == (2.0, 2.0, 2.0, 1)
+
+
+def test_all_zero_samples_do_not_divide_by_zero():
+    assert bootstrap_ratio([0.0, 0.0, 0.0], [0.0, 0.0, 0.0]) == (1.0, 1.0, 1.0)
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("huggingface_hub")
+pytest.importorskip("nltk")
+pytest.importorskip("sacrebleu")
+
+from helpers import hf_cache
+from helpers.hf_cache import enforce_budget
+
+GB = 1024 ** 3
+
+
+class FakeCache:
+    """Stand-in for huggingface_hub's HFCacheInfo that records which revisions get deleted."""
+
+    def __init__(self, repos):
+        self.repos = repos
+        self.size_on_disk = sum(repo.size_on_disk for repo in repos)
+        self.deleted = None
+
+    def delete_revisions(self, *revisions):
+        self.deleted = list(revisions)
+        freed = sum(repo.size_on_disk for repo in self.repos if repo.revisions[0].commit_hash in revisions)
+        return SimpleNamespace(expected_freed_size=freed, execute=lambda: None)
+
+
+def repo(repo_id, size_gb, last_accessed, repo_type="model"):
+    revision = SimpleNamespace(commit_hash=f"{repo_id}@main")
+    return SimpleNamespace(repo_id=repo_id, repo_type=repo_type, size_on_disk=size_gb * GB,
+                           last_accessed=last_accessed, revisions=[revision])
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    def install(*repos, in_use=()):
+        info = FakeCache(list(repos))
+        monkeypatch.setattr(hf_cache, "scan_cache_dir", lambda: info)
+        monkeypatch.setattr(hf_cache, "_in_use", lambda: list(in_use))
+        return info
+    return install
+
+
+def test_cache_within_budget_is_left_alone(cache):
+    info = cache(repo("a", 5, 1), repo("b", 5, 2))
+    assert enforce_budget(budget_gb=10) == 0
+    assert info.deleted is None
+
+
+def test_least_recently_used_models_go_first(cache):
+    info = cache(repo("new", 4, 3), repo("old", 4, 1), repo("middle", 4, 2))
+    assert enforce_budget(budget_gb=8) == 4 * GB
+    assert info.deleted == ["old@main"]
+
+
+def test_eviction_stops_once_under_budget(cache):
+    info = cache(repo("a", 3, 1), repo("b", 3, 2), repo("c", 3, 3), repo("d", 3, 4))
+    enforce_budget(budget_gb=6)
+    assert info.deleted == ["a@main", "b@main"]
+
+
+def test_datasets_are_never_evicted(cache):
+    info = cache(repo("wmt", 8, 1, repo_type="dataset"), repo("model", 4, 2))
+    enforce_budget(budget_gb=8)
+    assert info.deleted == ["model@main"]
+
+
+def test_pinned_loaded_and_kept_models_are_never_evicted(cache):
+    info = cache(repo(hf_cache.COMET_MODEL_NAME, 2, 1), repo("loaded", 2, 2), repo("kept", 2, 3), repo("free", 2, 4),
+                 in_use=["loaded"])
+    enforce_budget(budget_gb=6, keep=["kept"])
+    assert info.deleted == ["free@main"]
+
+
+def test_nothing_evictable_reclaims_nothing(cache):
+    info = cache(repo("loaded", 8, 1), in_use=["loaded"])
+    assert enforce_budget(budget_gb=4) == 0
+    assert info.deleted is None
+
+
+def test_unreadable_cache_reclaims_nothing(monkeypatch):
+    def scan():
+        raise OSError("no cache")
+
+    monkeypatch.setattr(hf_cache, "scan_cache_dir", scan)
+    assert enforce_budget(budget_gb=1) == 0
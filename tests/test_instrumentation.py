@@ -0,0 +1,51 @@
+import threading
+import time
+
+import pytest
+
+from helpers import instrumentation
+from helpers.instrumentation import set_job, span, take_job, timings_path
+
+JOB = {"backend": "helsinki", "model": "model", "dataset": "WMT", "language": "de", "options": {}}
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(instrumentation, "INSTRUMENTATION_ENABLED", True)
+    monkeypatch.setattr(instrumentation, "_records", {})
+    set_job(JOB)
+
+
+def test_disabled_span_is_a_shared_falsy_no_op(monkeypatch):
+    monkeypatch.setattr(instrumentation, "INSTRUMENTATION_ENABLED", False)
+    with span("generate") as s:
+        assert not s
+    assert span("generate") is span("decode")
+    assert take_job(JOB) == []
+
+
+def test_spans_add_up_per_stage(enabled):
+    for _ in range(2):
+        with span("generate") as s:
+            s.add(tokens_in=3, tokens_out=5)
+    [record] = take_job(JOB)
+    assert (record["stage"], record["calls"], record["tokens_in"], record["tokens_out"]) == ("generate", 2, 6, 10)
+    assert take_job(JOB) == []
+
+
+def test_cpu_time_includes_worker_threads(enabled):
+    def spin(seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    with span("generate"):
+        worker = threading.Thread(target=spin, args=(0.3,))  # Like torch's intra-op threads
+        worker.start()
+        worker.join()
+    [record] = take_job(JOB)
+    assert record["cpu_seconds"] >= 0.2
+
+
+def test_timings_sit_next_to_the_scores_csv():
+    assert timings_path("data/scores/Helsinki.csv") == "data/scores/Helsinki.timings.jsonl"
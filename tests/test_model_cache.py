@@ -0,0 +1,83 @@
+import pytest
+
+from helpers import model_cache
+from helpers.model_cache import cached_model_ids, get_model, pin_cached_models, release_model
+
+GB = 1024 ** 3
+
+
+class FakeModel:
+    def __init__(self, gigabytes):
+        self.size = int(gigabytes * GB)
+
+    def eval(self):
+        return self
+
+
+def size(model):
+    return model.size
+
+
+def load(gigabytes, loads):
+    def loader():
+        loads.append(gigabytes)
+        return FakeModel(gigabytes), "tokenizer"
+    return loader
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(model_cache, "MODEL_CACHE_BUDGET_GB", 10)
+    monkeypatch.setattr(model_cache, "_cache", model_cache.OrderedDict())
+    monkeypatch.setattr(model_cache, "_pinned", set())
+    monkeypatch.setattr(model_cache, "_stats", {})
+    monkeypatch.setattr(model_cache, "_free_memory", lambda: None)  # gc and CUDA cache, not under test
+
+
+def test_second_request_is_a_cache_hit():
+    loads = []
+    first = get_model("a", load(1, loads), size_fn=size)
+    assert get_model("a", load(1, loads), size_fn=size) == first
+    assert loads == [1]
+    assert model_cache.model_cache_stats()["a"]["hits"] == 1
+
+
+def test_dtype_and_device_are_separate_entries():
+    loads = []
+    get_model("a", load(1, loads), dtype="float32", size_fn=size)
+    get_model("a", load(1, loads), dtype="int8", size_fn=size)
+    get_model("a", load(1, loads), device="cuda", size_fn=size)
+    assert len(loads) == 3
+
+
+def test_least_recently_used_model_is_evicted():
+    loads = []
+    get_model("a", load(4, loads), size_fn=size)
+    get_model("b", load(4, loads), size_fn=size)
+    get_model("a", load(4, loads), size_fn=size)  # a is now the most recently used
+    get_model("c", load(4, loads), size_fn=size)
+    assert cached_model_ids() == {"a", "c"}
+
+
+def test_newest_model_stays_even_over_budget():
+    get_model("a", load(2, []), size_fn=size)
+    get_model("huge", load(30, []), size_fn=size)
+    assert cached_model_ids() == {"huge"}
+
+
+def test_pinned_models_are_never_evicted():
+    get_model("a", load(4, []), size_fn=size)
+    pin_cached_models()
+    get_model("b", load(4, []), size_fn=size)
+    get_model("c", load(4, []), size_fn=size)
+    assert cached_model_ids() == {"a", "c"}
+
+
+def test_release_drops_every_variant_of_a_model():
+    get_model("a", load(1, []), dtype="float32", size_fn=size)
+    get_model("a", load(1, []), dtype="int8", size_fn=size)
+    get_model("b", load(1, []), size_fn=size)
+    release_model("a")
+    assert cached_model_ids() == {"b"}
+    release_model()
+    assert cached_model_ids() == set()
@@ -0,0 +1,112 @@
+import asyncio
+import json
+
+from helpers.prompt_packing import build_prompt, pack_max_tokens, pack_requests, parse_reply, translate_packed
+
+
+def items_in(prompt):
+    return json.loads(prompt[prompt.index("\n\n") + 2:])
+
+
+def reply(translations):
+    return json.dumps({"translations": [{"id": i, "translation": t} for i, t in translations.items()]})
+
+
+def test_packs_respect_the_item_limit():
+    packs = pack_requests([(i, "word") for i in range(1, 11)], max_tokens=1000, max_items=4)
+    assert [len(pack) for pack in packs] == [4, 4, 2]
+
+
+def test_packs_respect_the_token_budget():
+    packs = pack_requests([(1, "x" * 30), (2, "x" * 30), (3, "x" * 30)], max_tokens=25)
+    assert [[item_id for item_id, _ in pack] for pack in packs] == [[1, 2], [3]]
+
+
+def test_oversized_sentence_gets_its_own_pack():
+    assert pack_requests([(1, "x" * 300), (2, "short")], max_tokens=10) == [[(1, "x" * 300)], [(2, "short")]]
+
+
+def test_pack_budget_leaves_room_for_the_reply():
+    assert pack_max_tokens(3000) == 1500
+
+
+def test_prompt_lists_every_id_and_language():
+    prompt = build_prompt([(1, "Hello."), (2, "Bye.")], "German")
+    assert "to German" in prompt
+    assert items_in(prompt) == [{"id": 1, "text": "Hello."}, {"id": 2, "text": "Bye."}]
+
+
+def test_parse_accepts_code_fences_and_string_ids():
+    text = '```json\n{"translations": [{"id": "2", "translation": " Tschüss. "}, {"id": 1, "translation": "Hallo."}]}\n```'
+    assert parse_reply(text, {1, 2}) == {1: "Hallo.", 2: "Tschüss."}
+
+
+def test_parse_drops_unexpected_duplicate_and_empty_entries():
+    text = json.dumps({"translations": [
+        {"id": 1, "translation": "Eins."}, {"id": 1, "translation": "Noch eins."},
+        {"id": 2, "translation": "  "}, {"id": 9, "translation": "Neun."}, {"id": 3}, "junk",
+    ]})
+    assert parse_reply(text, {1, 2, 3}) == {1: "Eins."}
+
+
+def test_parse_returns_nothing_for_invalid_json():
+    assert parse_reply("Sorry, I cannot help with that.", {1}) == {}
+    assert parse_reply('{"translations": [', {1}) == {}
+
+
+def test_parse_salvages_complete_entries_of_a_truncated_reply():
+    text = '{"translations": [{"id": 1, "translation": "Eins."}, {"translation": "Zwei.", "id": 2}, {"id": 3, "transl'
+    assert parse_reply(text, {1, 2, 3}) == {1: "Eins.", 2: "Zwei."}
+
+
+def test_parse_salvages_entries_around_a_malformed_one():
+    text = '{"translations": [{"id": 1, "translation": "Eins."}, {"id": 2, "translation": "Zw"ei."}, {"id": 3, "translation": "Drei."}]}'
+    assert parse_reply(text, {1, 2, 3}) == {1: "Eins.", 3: "Drei."}
+
+
+def test_missing_ids_are_requested_again():
+    prompts = []
+
+    async def send(prompt):
+        prompts.append(prompt)
+        items = items_in(prompt)
+        if len(prompts) == 1:
+            items = items[:-1]  # Drop the last id from the first reply
+        return reply({item["id"]: item["text"].upper() for item in items})
+
+    result = asyncio.run(translate_packed(["a", "b", "c"], "German", send))
+    assert result == ["A", "B", "C"]
+    assert [item["id"] for item in items_in(prompts[1])] == [3]
+
+
+def test_ids_still_missing_after_max_rounds_are_errors():
+    async def send(prompt):
+        return reply({item["id"]: item["text"] for item in items_in(prompt) if item["id"] != 2})
+
+    assert asyncio.run(translate_packed(["a", "b"], "German", send, max_rounds=2)) == ["a", "ERROR"]
+
+
+def test_re_requests_use_packs_half_the_size():
+    pack_sizes = []
+
+    async def send(prompt):
+        items = items_in(prompt)
+        pack_sizes.append(len(items))
+        if len(items) > 2:
+            return '{"translations": [{"id": 1, "transl'  # Cut off at the reply limit
+        return reply({item["id"]: item["text"] for item in items})
+
+    result = asyncio.run(translate_packed(list("abcd"), "German", send, max_items=4))
+    assert result == ["a", "b", "c", "d"]
+    assert pack_sizes == [4, 2, 2]
+
+
+def test_failed_requests_do_not_stop_other_packs():
+    async def send(prompt):
+        items = items_in(prompt)
+        if any(item["id"] == 1 for item in items):
+            raise ConnectionError("reset")
+        return reply({item["id"]: item["text"] for item in items})
+
+    result = asyncio.run(translate_packed(["a" * 30, "b" * 30], "German", send, max_tokens=15, max_rounds=1))
+    assert result == ["ERROR", "b" * 30]
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("datasets")
+pytest.importorskip("numpy")
+pytest.importorskip("pyarrow")
+pytest.importorskip("nltk")
+pytest.importorskip("sacrebleu")
+
+from helpers import runner, translation_cache
+from helpers.backends import BACKENDS
+from helpers.runner import plan_jobs, run_matrix
+
+
+@pytest.fixture(autouse=True)
+def fake_backend(monkeypatch):
+    monkeypatch.setitem(BACKENDS, "fake", {
+        "translate": lambda model_id, sentences, language, options: [s.upper() for s in sentences],
+        "params": lambda model_id, language, options: {},
+        "target": lambda model_id, language: language,
+        "local": False,
+    })
+    monkeypatch.setitem(runner.DATASET_LOADERS, "Fake", lambda language: (["a", "b"], ["A", "B"]))
+    monkeypatch.setattr(runner, "_samples", {})
+    monkeypatch.setattr(runner, "compute_bleu", lambda references, hypotheses: 100.0)
+    monkeypatch.setattr(runner, "compute_comet", lambda references, hypotheses, sources: 1.0)
+    monkeypatch.setattr(translation_cache, "TRANSLATION_CACHE_ENABLED", False)
+
+
+def run(tmp_path, matrix, **kwargs):
+    run_matrix(matrix, str(tmp_path / "scores.csv"), str(tmp_path / "translations.csv"), shard=(), workers=1, **kwargs)
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_after_model_keeps_the_models_of_pending_jobs(tmp_path, pipeline):
+    calls = []
+    matrix = [{"backend": "fake", "model": model, "datasets": ["Fake"], "languages": ["de", "fr"]} for model in ("m1", "m2", "m3")]
+    run(tmp_path, matrix, pipeline=pipeline, after_model=lambda model_id, keep: calls.append((model_id, set(keep))))
+    assert calls == [("m1", {"m2", "m3"}), ("m2", {"m3"}), ("m3", set())]
+
+
+def test_dataset_without_a_language_list_needs_languages():
+    with pytest.raises(ValueError, match="languages"):
+        plan_jobs([{"backend": "fake", "model": "m1", "datasets": ["montenegrin"]}])
+
+
+def test_failed_language_list_is_rejected(monkeypatch):
+    monkeypatch.setattr(runner, "LISTS_LANGUAGES", runner.LISTS_LANGUAGES | {"Fake"})
+    with pytest.raises(ValueError, match="languages"):
+        plan_jobs([{"backend": "fake", "model": "m1", "datasets": ["Fake"]}])
+
+
+def test_listed_languages_are_planned(monkeypatch):
+    monkeypatch.setattr(runner, "LISTS_LANGUAGES", runner.LISTS_LANGUAGES | {"Fake"})
+    monkeypatch.setitem(runner.DATASET_LOADERS, "Fake", lambda language: ["de", "fr"])
+    jobs = plan_jobs([{"backend": "fake", "model": "m1", "datasets": ["Fake"]}])
+    assert [job["language"] for job in jobs] == ["de", "fr"]
@@ -0,0 +1,126 @@
+import csv
+
+import pytest
+
+from helpers.merge_shards import find_shards, merge_csv, merge_shards
+from helpers.sharding import assign_shards, job_cost, parse_shard, shard_from_argv, shard_path
+
+
+def job(backend, model, dataset="WMT", language="de"):
+    return {"backend": backend, "model": model, "dataset": dataset, "language": language, "options": {}}
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+    return str(path)
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_parse_shard():
+    assert parse_shard(" 2 / 4 ") == (2, 4)
+    for value in ("0/4", "5/4", "2-4", ""):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shard_argument_wins_over_the_environment(monkeypatch):
+    monkeypatch.setenv("RUNNER_SHARD", "1/2")
+    assert shard_from_argv(["--shard", "3/4"]) == (3, 4)
+    assert shard_from_argv(["--shard=2/3"]) == (2, 3)
+    assert shard_from_argv([]) == (1, 2)
+
+
+def test_every_job_lands_on_exactly_one_shard():
+    jobs = [job("helsinki", f"m{i}", language=l) for i in range(5) for l in ("de", "fr", "es")]
+    shards, _ = assign_shards(jobs, 3)
+    assert sorted(map(id, (j for shard in shards for j in shard))) == sorted(map(id, jobs))
+
+
+def test_shards_keep_plan_order():
+    jobs = [job("nllb", "nllb", language=l) for l in ("de", "fr")] + [job("m2m", "m2m", language=l) for l in ("de", "fr")]
+    for shard in assign_shards(jobs, 2)[0]:
+        assert shard == [j for j in jobs if j in shard]
+
+
+def test_expensive_model_is_balanced_against_many_cheap_ones():
+    jobs = [job("towerinstruct", "Unbabel/TowerInstruct-7B-v0.2")] + [job("helsinki", f"m{i}") for i in range(20)]
+    shards, loads = assign_shards(jobs, 2)
+    assert [len(shard) for shard in shards] == [1, 20]
+    assert loads[0] > loads[1]
+
+
+def test_small_job_joins_the_shard_that_already_loads_its_model():
+    jobs = [job("nllb", "nllb"), job("m2m", "m2m"), job("nllb", "nllb", dataset="OPUS")]
+    shards, _ = assign_shards(jobs, 2)
+    assert [j["backend"] for j in shards[0]] == ["nllb", "nllb"]
+
+
+def test_split_is_deterministic():
+    jobs = [job("helsinki", f"m{i % 3}", language=str(i)) for i in range(12)]
+    assert assign_shards(jobs, 4) == assign_shards([dict(j) for j in jobs], 4)
+
+
+def test_towerinstruct_cost_scales_with_size():
+    assert job_cost(job("towerinstruct", "Unbabel/TowerInstruct-13B-v0.1")) > job_cost(job("towerinstruct", "Unbabel/TowerInstruct-7B-v0.2"))
+
+
+def test_find_shards_orders_by_index(tmp_path):
+    canonical = str(tmp_path / "scores.csv")
+    for index in (10, 2, 1):
+        write_csv(shard_path(canonical, index, 10), [["Dataset"]])
+    write_csv(tmp_path / "scores.shardXofY.csv", [["Dataset"]])
+    assert find_shards(canonical) == [shard_path(canonical, i, 10) for i in (1, 2, 10)]
+
+
+def test_merge_sorts_keys_and_keeps_sentence_order(tmp_path):
+    header = ["Dataset", "Language", "Source Sentence", "Translation", "Reference Sentence"]
+    a = write_csv(tmp_path / "a.csv", [header, ["WMT", "fr", "b", "B", "b"], ["WMT", "fr", "a", "A", "a"]])
+    b = write_csv(tmp_path / "b.csv", [header, ["WMT", "de", "z", "Z", "z"]])
+    merge_csv(str(tmp_path / "out.csv"), [a, b])
+    assert read_csv(tmp_path / "out.csv") == [header, ["WMT", "de", "z", "Z", "z"], ["WMT", "fr", "b", "B", "b"], ["WMT", "fr", "a", "A", "a"]]
+
+
+def test_later_source_replaces_a_key(tmp_path):
+    header = ["Model Name", "Dataset", "Language", "BLEU", "COMET"]
+    old = write_csv(tmp_path / "old.csv", [header, ["m", "WMT", "de", "Error", "Error"], ["m", "WMT", "fr", "30", "0.8"]])
+    new = write_csv(tmp_path / "new.csv", [header, ["m", "WMT", "de", "25", "0.7"]])
+    assert merge_csv(str(tmp_path / "out.csv"), [old, new]) == 2
+    assert read_csv(tmp_path / "out.csv")[1:] == [["m", "WMT", "de", "25", "0.7"], ["m", "WMT", "fr", "30", "0.8"]]
+
+
+def test_rerun_appended_to_one_file_replaces_the_earlier_block(tmp_path):
+    header = ["Dataset", "Language", "Source Sentence", "Translation", "Reference Sentence"]
+    source = write_csv(tmp_path / "a.csv", [header, ["WMT", "de", "a", "ERROR", "a"], ["WMT", "fr", "a", "A", "a"],
+                                            ["WMT", "de", "a", "A", "a"]])
+    merge_csv(str(tmp_path / "out.csv"), [source])
+    assert read_csv(tmp_path / "out.csv")[1:] == [["WMT", "de", "a", "A", "a"], ["WMT", "fr", "a", "A", "a"]]
+
+
+def test_repeated_sentences_of_one_block_are_kept(tmp_path):
+    header = ["Dataset", "Language", "Source Sentence", "Translation", "Reference Sentence"]
+    source = write_csv(tmp_path / "a.csv", [header, ["WMT", "de", "Yes.", "Ja.", "Ja."], ["WMT", "de", "Yes.", "Ja.", "Ja."]])
+    merge_csv(str(tmp_path / "out.csv"), [source])
+    assert len(read_csv(tmp_path / "out.csv")) == 3
+
+
+def test_mismatched_headers_are_rejected(tmp_path):
+    a = write_csv(tmp_path / "a.csv", [["Dataset", "Language", "BLEU", "COMET"]])
+    b = write_csv(tmp_path / "b.csv", [["Model Name", "Dataset", "Language", "BLEU", "COMET"]])
+    with pytest.raises(ValueError):
+        merge_csv(str(tmp_path / "out.csv"), [a, b])
+
+
+def test_merge_shards_is_idempotent(tmp_path):
+    results, translations = str(tmp_path / "r.csv"), str(tmp_path / "t.csv")
+    header = ["Dataset", "Language", "BLEU", "COMET"]
+    write_csv(shard_path(results, 1, 2), [header, ["WMT", "de", "30", "0.8"]])
+    write_csv(shard_path(results, 2, 2), [header, ["TED", "de", "20", "0.7"]])
+    merge_shards(results, translations)
+    first = read_csv(results)
+    merge_shards(results, translations)
+    assert read_csv(results) == first == [header, ["TED", "de", "20", "0.7"], ["WMT", "de", "30", "0.8"]]
@@ -0,0 +1,58 @@
+import hashlib
+import json
+
+from datasets_loader import snapshot
+from datasets_loader.snapshot import load_snapshot, snapshots_disabled
+
+
+def write_bundle(bundle_dir, sources, references, sha256=None):
+    content = json.dumps({"sources": sources, "references": references}).encode("utf-8")
+    (bundle_dir / "WMT").mkdir(parents=True)
+    (bundle_dir / "WMT" / "de.json").write_bytes(content)
+    manifest = {"files": {"WMT/de.json": {"sha256": sha256 or hashlib.sha256(content).hexdigest(), "count": len(sources)}}}
+    (bundle_dir / snapshot.MANIFEST_FILE).write_text(json.dumps(manifest))
+
+
+def test_bundle_is_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOTS_ENABLED", True)
+    write_bundle(tmp_path, ["Hello."], ["Hallo."])
+    assert load_snapshot("WMT", "de", str(tmp_path)) == (["Hello."], ["Hallo."])
+    assert load_snapshot("WMT", "fr", str(tmp_path)) is None
+
+
+def test_hash_mismatch_ignores_the_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOTS_ENABLED", True)
+    write_bundle(tmp_path, ["Hello."], ["Hallo."], sha256="0" * 64)
+    assert load_snapshot("WMT", "de", str(tmp_path)) is None
+
+
+def test_snapshots_disabled_skips_the_bundle(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOTS_ENABLED", True)
+    write_bundle(tmp_path, ["Hello."], ["Hallo."])
+    with snapshots_disabled():
+        assert load_snapshot("WMT", "de", str(tmp_path)) is None
+    assert snapshot.SNAPSHOTS_ENABLED is True
+
+
+def test_snapshots_disabled_keeps_a_user_opt_out(monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOTS_ENABLED", False)
+    with snapshots_disabled():
+        pass
+    assert snapshot.SNAPSHOTS_ENABLED is False
+
+
+def test_empty_sample_is_not_exported(tmp_path, monkeypatch):
+    def loader(language):
+        return ([], []) if language == "fr" else (["Hello."], ["Hallo."])
+
+    monkeypatch.setattr(snapshot, "_snapshot_sources", lambda opus_pairs: {"WMT": (loader, ["de", "fr"])})
+    snapshot.export_snapshots(str(tmp_path))
+    manifest = json.loads((tmp_path / snapshot.MANIFEST_FILE).read_text())
+    assert list(manifest["files"]) == ["WMT/de.json"]
+    assert not (tmp_path / "WMT" / "fr.json").exists()
+
+
+def test_empty_sample_in_an_old_bundle_falls_back_to_the_hub(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOTS_ENABLED", True)
+    write_bundle(tmp_path, [], [])
+    assert load_snapshot("WMT", "de", str(tmp_path)) is None
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from helpers.sqlite_cache import connect, lookup
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, score REAL)"
+
+
+def test_lookup_returns_only_stored_keys(tmp_path):
+    conn = connect(str(tmp_path / "cache.sqlite"), SCHEMA)
+    with conn:
+        conn.executemany("INSERT INTO scores VALUES (?, ?)", [("a", 0.5), ("b", 0.7)])
+    assert lookup(conn, "scores", "score", ["a", "c", "b"]) == {"a": 0.5, "b": 0.7}
+
+
+def test_lookup_handles_more_keys_than_sqlite_variables(tmp_path):
+    conn = connect(str(tmp_path / "cache.sqlite"), SCHEMA)
+    keys = [f"k{i}" for i in range(1200)]
+    with conn:
+        conn.executemany("INSERT INTO scores VALUES (?, ?)", [(key, i) for i, key in enumerate(keys)])
+    assert len(lookup(conn, "scores", "score", keys)) == 1200
+
+
+def test_connection_is_reused_within_a_thread(tmp_path):
+    path = str(tmp_path / "nested" / "cache.sqlite")
+    assert connect(path, SCHEMA) is connect(path, SCHEMA)
+    assert connect(path, SCHEMA).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_each_thread_gets_its_own_connection(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    connections = []
+    thread = threading.Thread(target=lambda: connections.append(connect(path, SCHEMA)))
+    thread.start()
+    thread.join()
+    assert connections[0] is not connect(path, SCHEMA)
+
+
+@pytest.fixture
+def comet_cache(tmp_path, monkeypatch):
+    pytest.importorskip("nltk")
+    pytest.importorskip("sacrebleu")
+    from helpers import evaluation
+    monkeypatch.setattr(evaluation, "COMET_CACHE_PATH", str(tmp_path / "comet.sqlite"))
+    monkeypatch.setattr(evaluation, "COMET_CACHE_ENABLED", True)
+    return evaluation
+
+
+def test_cached_comet_scores_skip_the_model(comet_cache, monkeypatch):
+    conn = connect(comet_cache.COMET_CACHE_PATH, comet_cache.COMET_CACHE_SCHEMA)
+    with conn:
+        conn.executemany("INSERT INTO comet_scores VALUES (?, ?, ?)", [
+            (comet_cache.comet_cache_key("src 1", "mt 1", "ref 1"), comet_cache.COMET_MODEL_NAME, 0.25),
+            (comet_cache.comet_cache_key("src 2", "mt 2", "ref 2"), comet_cache.COMET_MODEL_NAME, 0.75),
+        ])
+    monkeypatch.setattr(comet_cache, "get_comet_model", lambda: pytest.fail("the COMET model must not be loaded"))
+    assert comet_cache.compute_comet_scores(["ref 1", "ref 2"], ["mt 1", "mt 2"], ["src 1", "src 2"]) == (0.5, [0.25, 0.75])
+
+
+def test_comet_key_covers_every_field(comet_cache):
+    key = comet_cache.comet_cache_key("src", "mt", "ref")
+    assert key != comet_cache.comet_cache_key("src", "ref", "mt")
+    assert key != comet_cache.comet_cache_key("src ", "mt", "ref")
+
+
+def test_empty_input_scores_nothing(comet_cache):
+    assert comet_cache.compute_comet_scores([], [], []) == (0.0, [])
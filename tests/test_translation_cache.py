@@ -0,0 +1,54 @@
+import pytest
+
+from helpers import translation_cache
+from helpers.translation_cache import cached_translate
+
+
+@pytest.fixture(autouse=True)
+def cache_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_cache, "TRANSLATION_CACHE_PATH", str(tmp_path / "translations.sqlite"))
+    monkeypatch.setattr(translation_cache, "TRANSLATION_CACHE_ENABLED", True)
+
+
+def upper(calls):
+    def translate(sentences):
+        calls.append(list(sentences))
+        return [sentence.upper() for sentence in sentences]
+    return translate
+
+
+def test_only_missing_sentences_are_translated():
+    calls = []
+    cached_translate("model", {}, "de", ["a", "b"], upper(calls))
+    assert cached_translate("model", {}, "de", ["b", "c", "a"], upper(calls)) == ["B", "C", "A"]
+    assert calls == [["a", "b"], ["c"]]
+
+
+def test_params_and_language_are_part_of_the_key():
+    calls = []
+    cached_translate("model", {"num_beams": 5}, "de", ["a"], upper(calls))
+    cached_translate("model", {"num_beams": 1}, "de", ["a"], upper(calls))
+    cached_translate("model", {"num_beams": 5}, "fr", ["a"], upper(calls))
+    assert len(calls) == 3
+
+
+def test_error_and_empty_translations_are_not_stored():
+    cached_translate("model", {}, "de", ["a", "b"], lambda sentences: ["ERROR", ""])
+    calls = []
+    assert cached_translate("model", {}, "de", ["a", "b"], upper(calls)) == ["A", "B"]
+    assert calls == [["a", "b"]]
+
+
+def test_count_mismatch_is_padded_and_not_cached():
+    assert cached_translate("model", {}, "de", ["a", "b", "c"], lambda sentences: ["x", "y"]) == ["x", "y", "ERROR"]
+    calls = []
+    cached_translate("model", {}, "de", ["a", "b", "c"], upper(calls))
+    assert calls == [["a", "b", "c"]]
+
+
+def test_disabled_cache_always_translates(monkeypatch):
+    monkeypatch.setattr(translation_cache, "TRANSLATION_CACHE_ENABLED", False)
+    calls = []
+    cached_translate("model", {}, "de", ["a"], upper(calls))
+    cached_translate("model", {}, "de", ["a"], upper(calls))
+    assert calls == [["a"], ["a"]]